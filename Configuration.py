@@ -1591,6 +1591,35 @@ class Configuration_2_1_0:
           Command = Configuration_2_1_0.Command.SensorStop.Command
         )
 
+    # commands whose docstring allows changing them "even when the sensor is running"
+    runtimeCommands: tuple[str, ...] = ("cfarCfg", "peakGrouping", "multiObjBeamForming", "calibDcRangeSig", "extendedMaxVelocity", "clutterRemoval", "compRangeBiasAndRxChanPhase", "measureRangeBiasAndRxChanPhase")
+    # commands whose docstring allows changing them "between sensorStop and sensorStart" and that overwrite their previous value
+    # (profileCfg and chirpCfg are allowed too, but they add to the profile/chirp lists of the device, which only flushCfg clears)
+    restartCommands: tuple[str, ...] = ("adcbufCfg", "frameCfg", "advFrameCfg", "subFrameCfg", "guiMonitor")
+
+    @staticmethod
+    def reconfiguration(previous: list[str] | None, commandLines: list[str]) -> tuple[str, list[str]]:
+      """Find the cheapest way to go from the applied `previous` commandLines to `commandLines`
+
+      Args:
+        previous (list[str] | None): commandLines last applied (from `commandLines()`), None if unknown
+        commandLines (list[str]): commandLines to apply (from `commandLines()`)
+
+      Returns:
+        tuple[str, list[str]]: `(mode, changed)`, where mode is
+          "none":    nothing changed
+          "runtime": send `changed` (runtimeCommands only), even while the sensor is running
+          "restart": send `changed` (restartCommands and runtimeCommands) between sensorStop and sensorStart
+          "full":    send every commandLine (from flushCfg) between sensorStop and sensorStart
+      """
+      if previous is None or len(previous) != len(commandLines): return "full", list(commandLines)
+      changed: list[str] = [commandLine for commandLine, old in zip(commandLines, previous) if commandLine != old]
+      commands: set[str] = set(commandLine.split(' ')[0] for commandLine in changed)
+      if len(changed) == 0: return "none", changed
+      if commands.issubset(Configuration_2_1_0.Command.runtimeCommands): return "runtime", changed
+      if commands.issubset(Configuration_2_1_0.Command.runtimeCommands + Configuration_2_1_0.Command.restartCommands): return "restart", changed
+      return "full", list(commandLines)
+
     def __init__(self, platform: str): # TODO: add self.platform to control supported commands
       """Initialize all command
 
@@ -1,15 +1,21 @@
 # %%
 import math
-import copy
+import zlib
+import struct
 import datetime
+import typing
+import threading
+import collections
 
 
 import numpy # Version: 1.26.0
 
 try:
   from . import Logging
+  from . import RingBuffer
 except ImportError:
   import Logging
+  import RingBuffer
 
 # %%
 class Converter:
@@ -28,10 +34,12 @@ class Converter:
 class DataFrame:
   class DetectedObjects:
     class DetetedInfomation:
+      __slots__ = ("numDetetedObj", "xyzQFormat")
       def __init__(self):
-        self.numDetetedObj: numpy.uint16 | None = None
-        self.xyzQFormat: numpy.uint16 | None = None
+        self.numDetetedObj: int | None = None
+        self.xyzQFormat: int | None = None
     class DetectedObj:
+      __slots__ = ("rangeIdx", "dopplerIdx", "peakVal", "x", "y", "z")
       def __init__(self, rangeIdx: numpy.uint16 | None = None, dopplerIdx: numpy.int16 | None = None, peakVal: numpy.uint16 | None = None, x: numpy.int16 | None = None, y: numpy.int16 | None = None, z: numpy.int16 | None = None):
         self.rangeIdx:    numpy.uint16 | None = rangeIdx
         self.dopplerIdx:  numpy. int16 | None = dopplerIdx
@@ -39,27 +47,99 @@ class DataFrame:
         self.x:           numpy. int16 | None = x
         self.y:           numpy. int16 | None = y
         self.z:           numpy. int16 | None = z
-    def __init__(self):
+    # one detected object as laid out in the TLV
+    dtype: numpy.dtype = numpy.dtype([("rangeIdx", "<u2"), ("dopplerIdx", "<i2"), ("peakVal", "<u2"), ("x", "<i2"), ("y", "<i2"), ("z", "<i2")])
+    empty: numpy.ndarray = numpy.empty(0, dtype=dtype) # shared by every section without objects
+    __slots__ = ("infomation", "array", "_Objects")
+    def __init__(self, array: numpy.ndarray | None = None):
       self.infomation: DataFrame.DetectedObjects.DetetedInfomation | None = DataFrame.DetectedObjects.DetetedInfomation()
-      self.Objects: list[DataFrame.DetectedObjects.DetectedObj] | None = list()
+      self.array: numpy.ndarray = array if array is not None else DataFrame.DetectedObjects.empty # structured view over the frame bytes
+      self._Objects: list[DataFrame.DetectedObjects.DetectedObj] | None = None
+    @property
+    def Objects(self) -> list[DetectedObj]:
+      """Detected objects as `DetectedObj` instances, built from `array` on first access"""
+      if self._Objects is None:
+        self._Objects = [DataFrame.DetectedObjects.DetectedObj(*detectedObj) for detectedObj in self.array.tolist()]
+      return self._Objects
+    @Objects.setter
+    def Objects(self, Objects: list[DetectedObj]) -> None:
+      self._Objects = Objects
+      self.array = numpy.array([(detectedObj.rangeIdx, detectedObj.dopplerIdx, detectedObj.peakVal, detectedObj.x, detectedObj.y, detectedObj.z) for detectedObj in Objects], dtype=DataFrame.DetectedObjects.dtype)
     def detectedPoints(self):
-      return [(Converter.QFormat.parse(self.infomation.xyzQFormat, detectedObj.x), Converter.QFormat.parse(self.infomation.xyzQFormat, detectedObj.y), Converter.QFormat.parse(self.infomation.xyzQFormat, detectedObj.z)) for detectedObj in self.Objects]
+      if len(self.array) == 0: return []
+      return [tuple(point) for point in self.points_array().tolist()]
+    def points_array(self, units: "DataFrame.PointUnits | None" = None) -> numpy.ndarray:
+      """Detected points as one float32 array
+
+      Args:
+        units (DataFrame.PointUnits | None, optional): Lookup tables to append range (m) and radial velocity (m/s) columns. Defaults to None.
+
+      Returns:
+        numpy.ndarray: (N, 3) of (x, y, z) in meters, or (N, 5) of (x, y, z, range, velocity) with `units`
+      """
+      points = numpy.empty((len(self.array), 3 if units is None else 5), dtype=numpy.float32)
+      if len(self.array) == 0: return points
+      # x, y, z are the last three int16 of each 12 bytes object, scaled by xyzQFormat in one operation
+      numpy.multiply(self.array.view("<i2").reshape(-1, 6)[:, 3:], numpy.float32(1 / (1 << self.infomation.xyzQFormat)), out=points[:, :3], casting="unsafe")
+      if units is not None:
+        points[:, 3] = units.range(self.array["rangeIdx"])
+        points[:, 4] = units.velocity(self.array["dopplerIdx"])
+      return points
+
+  class PointUnits:
+    """Lookup tables from rangeIdx/dopplerIdx to range (m) and radial velocity (m/s), built once per configuration"""
+    __slots__ = ("numRangeBins", "rangeIdxToMeters", "numDopplerBins", "dopplerResolutionMps", "rangeMeters", "velocityMps")
+    def __init__(self, numRangeBins: int, rangeIdxToMeters: float, numDopplerBins: int, dopplerResolutionMps: float) -> None:
+      """Initialize PointUnits
+
+      Args:
+        numRangeBins (int): Range FFT size
+        rangeIdxToMeters (float): Meters per range bin
+        numDopplerBins (int): Doppler FFT size
+        dopplerResolutionMps (float): Meters per second per doppler bin
+      """
+      self.numRangeBins: int = int(numRangeBins)
+      self.rangeIdxToMeters: float = rangeIdxToMeters
+      self.numDopplerBins: int = int(numDopplerBins)
+      self.dopplerResolutionMps: float = dopplerResolutionMps
+      self.rangeMeters: numpy.ndarray = (numpy.arange(self.numRangeBins) * rangeIdxToMeters).astype(numpy.float32)
+      # dopplerIdx wraps around numDopplerBins, the upper half is negative velocity
+      dopplerIdx = numpy.arange(self.numDopplerBins)
+      self.velocityMps: numpy.ndarray = (numpy.where(dopplerIdx < self.numDopplerBins//2, dopplerIdx, dopplerIdx - self.numDopplerBins) * dopplerResolutionMps).astype(numpy.float32)
+    @staticmethod
+    def from_parameter(parameter) -> "DataFrame.PointUnits | None":
+      """Build from `Configuration_2_1_0.Parameter`, None if the profile is not configured yet"""
+      if parameter.numRangeBins is None or parameter.rangeIdxToMeters is None or parameter.numDopplerBins is None or parameter.dopplerResolutionMps is None: return None
+      return DataFrame.PointUnits(parameter.numRangeBins, parameter.rangeIdxToMeters, parameter.numDopplerBins, parameter.dopplerResolutionMps)
+    def matches(self, parameter) -> bool:
+      """Whether the tables were built from the same values as `parameter`"""
+      return (self.numRangeBins, self.rangeIdxToMeters, self.numDopplerBins, self.dopplerResolutionMps) == (parameter.numRangeBins, parameter.rangeIdxToMeters, parameter.numDopplerBins, parameter.dopplerResolutionMps)
+    def range(self, rangeIdx: numpy.ndarray) -> numpy.ndarray:
+      return self.rangeMeters.take(rangeIdx, mode="clip")
+    def velocity(self, dopplerIdx: numpy.ndarray) -> numpy.ndarray:
+      return self.velocityMps.take(dopplerIdx, mode="wrap")
 
   class LogMagRange:
+    __slots__ = ("logMagRange",)
     def __init__(self):
-      self.logMagRange: list[numpy.uint16] | None = None
+      self.logMagRange: numpy.ndarray | None = None # uint16 view, shape (numRangeBins,)
 
   class NoiseProfile:
+    __slots__ = ("noiseProfile",)
     def __init__(self):
-      self.noiseProfile: list[numpy.uint16] | None = None
+      self.noiseProfile: numpy.ndarray | None = None # uint16 view, shape (numRangeBins,)
 
   class RangeAzimuthHeatMap:
     class Cmplx16ImRe:
+      __slots__ = ("imag", "real")
       def __init__(self, imag: numpy.uint16, real: numpy.uint16):
         self.imag: numpy.uint16 = imag
         self.real: numpy.uint16 = real
       def __str__(self) -> str:
         return "({real}, {imag}i)".format(real=self.real, imag=self.imag)
+    empty_cmplx16ImRe: numpy.ndarray = numpy.empty((0, 2), dtype="<i2")
+    empty_complex64: numpy.ndarray = numpy.empty(0, dtype=numpy.complex64)
+    __slots__ = ("numRangeBins", "numVirtualAntAzim", "cmplx16ImRe", "rangeAzimuthHeatMap")
     def __init__(self, numRangeBins: numpy.uint32 | None = None, numVirtualAntAzim: numpy.uint32 | None = None, numTotal: numpy.uint32 | None = None):
       self.numRangeBins:      numpy.uint32 | None = None
       self.numVirtualAntAzim: numpy.uint32 | None = None
@@ -71,22 +151,28 @@ class DataFrame:
           self.numVirtualAntAzim = numTotal
         else: 
           raise ValueError("when specify `numRangeBins`, need to specify `numVirtualAntAzim` or `numTotal`")
-      self.rangeAzimuthHeatMap: list[list[DataFrame.RangeAzimuthHeatMap.Cmplx16ImRe]] | list[DataFrame.RangeAzimuthHeatMap.Cmplx16ImRe] = list()
+      self.cmplx16ImRe: numpy.ndarray = DataFrame.RangeAzimuthHeatMap.empty_cmplx16ImRe # int16 (imag, real) view, shape (numRangeBins, numVirtualAntAzim, 2)
+      self.rangeAzimuthHeatMap: numpy.ndarray = DataFrame.RangeAzimuthHeatMap.empty_complex64 # shape (numRangeBins, numVirtualAntAzim), or flat if `numRangeBins` is unknown
     def __str__(self) -> str:
-      string = "["
-      for item in self.rangeAzimuthHeatMap:
-        if self.numRangeBins is not None and self.numVirtualAntAzim is not None: # item: list[Cmplx16ImRe]
-          string += "["
-          for i in item:
-            string += str(i) + ", "
-          string = string[0:-2] + "], "
-          pass
-        else: # item: Cmplx16ImRe
-          string += str(item) + ", "
-      string = string[0:-2] + "]"
-      return string
+      return numpy.array2string(self.rangeAzimuthHeatMap, separator=", ", threshold=numpy.inf)
+    @staticmethod
+    def complex64(cmplx16ImRe: numpy.ndarray) -> numpy.ndarray:
+      """Convert int16 (imag, real) pairs to complex64
+
+      Args:
+        cmplx16ImRe (numpy.ndarray): int16 array whose last axis is (imag, real)
+
+      Returns:
+        numpy.ndarray: complex64 array without the last axis
+      """
+      heatMap = numpy.empty(cmplx16ImRe.shape[:-1], dtype=numpy.complex64)
+      heatMap.real = cmplx16ImRe[..., 1]
+      heatMap.imag = cmplx16ImRe[..., 0]
+      return heatMap
 
   class RangeDopplerHeatMap:
+    empty: numpy.ndarray = numpy.empty(0, dtype="<u2")
+    __slots__ = ("numRangeBins", "numDopplerBins", "rangeDopplerHeatMap")
     def __init__(self, numRangeBins: numpy.uint32 | None = None, numDopplerBins: numpy.uint32 | None = None, numTotal: numpy.uint32 | None = None):
       self.numRangeBins:      numpy.uint32 | None = None
       self.numDopplerBins:    numpy.uint32 | None = None
@@ -98,19 +184,48 @@ class DataFrame:
           self.numDopplerBins = numTotal
         else: 
           raise ValueError("when specify `numRangeBins`, need to specify `numDopplerBins` or `numTotal`")
-      self.rangeDopplerHeatMap: list[list[numpy.uint16]] | list[numpy.uint16] = list()
+      self.rangeDopplerHeatMap: numpy.ndarray = DataFrame.RangeDopplerHeatMap.empty # uint16 view, shape (numRangeBins, numDopplerBins), or flat if `numRangeBins` is unknown
 
   class StatsInfo:
+    __slots__ = ("interFrameProcessingTime", "transmitOutputTime", "interFrameProcessingMargin", "interChirpProcessingMargin", "activeFrameCPULoad", "interFrameCPULoad")
     def __init__(self):
-      self.interFrameProcessingTime:   numpy.uint32 | None = None
-      self.transmitOutputTime:         numpy.uint32 | None = None
-      self.interFrameProcessingMargin: numpy.uint32 | None = None
-      self.interChirpProcessingMargin: numpy.uint32 | None = None
-      self.activeFrameCPULoad:         numpy.uint32 | None = None
-      self.interFrameCPULoad:          numpy.uint32 | None = None
+      self.interFrameProcessingTime:   int | None = None
+      self.transmitOutputTime:         int | None = None
+      self.interFrameProcessingMargin: int | None = None
+      self.interChirpProcessingMargin: int | None = None
+      self.activeFrameCPULoad:         int | None = None
+      self.interFrameCPULoad:          int | None = None
 
   magicWords: tuple[numpy.uint16] = (0x0102, 0x0304, 0x0506, 0x0708)
   magicBytes: tuple[numpy.uint8] = (0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07)
+  magicPattern: bytes = bytes(magicBytes)
+  headerLength: int = 40 # magicBytes and the longest (xWR16xx) header
+
+  # precompiled little-endian decoders, applied with `unpack_from` at an offset of the packet
+  headerStruct:             struct.Struct = struct.Struct("<7I") # version, totalPacketLen, platform, frameNumber, timeCpuCycles, numDetectedObj, numTLVs
+  headerStruct_xWR16xx:     struct.Struct = struct.Struct("<8I") # `headerStruct` followed by subFrameNumber
+  packetLengthStruct:       struct.Struct = struct.Struct("<I")  # totalPacketLen
+  TLVHeaderStruct:          struct.Struct = struct.Struct("<2I") # TypeId, Length
+  detectedInfomationStruct: struct.Struct = struct.Struct("<2H") # numDetetedObj, xyzQFormat
+  statsInfoStruct:          struct.Struct = struct.Struct("<6I") # interFrameProcessingTime, transmitOutputTime, interFrameProcessingMargin, interChirpProcessingMargin, activeFrameCPULoad, interFrameCPULoad
+
+  # header sanity rules, see `checkHeader`
+  versionMajors: tuple[int, ...] = (1, 2, 3) # SDK major versions
+  platformMasks: dict[str, int] = {"xWR14xx": 0x00001400, "xWR16xx": 0x00001600} # `platform & 0x0000ff00`
+  maxPacketLen: int = 1 << 20
+  maxNumTLVs: int = 32
+
+  # TypeId of the TLVs defined by SDK 2.1
+  TLV_detectedObjects:     int = 1
+  TLV_logMagRange:         int = 2
+  TLV_noiseProfile:        int = 3
+  TLV_rangeAzimuthHeatMap: int = 4
+  TLV_rangeDopplerHeatMap: int = 5
+  TLV_statsInfo:           int = 6
+
+  __slots__ = ("log_enable", "logger", "version", "totalPacketLen", "platform", "frameNumber", "timeCpuCycles", "numDetectedObj", "numTLVs", "subFrameNumber", "numRangeBins", "packet", "TLVs", "_sections", "CRC32", "time", "iscomplete", "pool", "refs", "_storage", "layoutMatched", "_tail")
+
+  emptyFrame: "DataFrame" # set below the class
 
   def __init__(self, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False) -> None:
     """Initialize DataFrame
@@ -120,46 +235,247 @@ class DataFrame:
 
     # header
     # self.magicWords: tuple[numpy.uint8] = (0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07) # `self.magicWords` will be removed, and use `DataFrame.magicBytes` instead
-    self.version:         numpy.uint32 | None = None
-    self.totalPacketLen:  numpy.uint32 | None = None
-    self.platform:        numpy.uint32 | None = None
-    self.frameNumber:     numpy.uint32 | None = None
-    self.timeCpuCycles:   numpy.uint32 | None = None
-    self.numDetectedObj:  numpy.uint32 | None = None
-    self.numTLVs:         numpy.uint32 | None = None
-    self.subFrameNumber:  numpy.uint32 | None = None
-    # # other arguments
-    # self.numRangeBins:      numpy.uint32 | None = None
+    self.version:         int | None = None
+    self.totalPacketLen:  int | None = None
+    self.platform:        int | None = None
+    self.frameNumber:     int | None = None
+    self.timeCpuCycles:   int | None = None
+    self.numDetectedObj:  int | None = None
+    self.numTLVs:         int | None = None
+    self.subFrameNumber:  int | None = None
+    # other arguments
+    self.numRangeBins:    int | None = None # from the length of logMagRange or noiseProfile
     # self.numVirtualAntAzim: numpy.uint32 | None = None
     # self.numDopplerBins:    numpy.uint32 | None = None
-    # data contents
-    self.detectedObjects:     DataFrame.DetectedObjects     | None = DataFrame.DetectedObjects()
-    self.logMagRange:         DataFrame.LogMagRange         | None = DataFrame.LogMagRange()
-    self.noiseProfile:        DataFrame.NoiseProfile        | None = DataFrame.NoiseProfile()
-    self.rangeAzimuthHeatMap: DataFrame.RangeAzimuthHeatMap | None = DataFrame.RangeAzimuthHeatMap()
-    self.rangeDopplerHeatMap: DataFrame.RangeDopplerHeatMap | None = DataFrame.RangeDopplerHeatMap()
-    self.statsInfo:           DataFrame.StatsInfo           | None = DataFrame.StatsInfo()
-
-    self.CRC32: numpy.uint32 | None = None
+    # data contents, decoded from `packet` on first access (see `section`)
+    self.packet: bytes | None = None
+    self.TLVs: dict[int, tuple[int, int]] = dict() # TypeId -> (index, Length) of the TLV contents in `packet`
+    self._sections: dict[int, object] = dict() # TypeId -> decoded contents
+
+    self.CRC32: int | None = None # `zlib.crc32` of the whole packet
     self.time: datetime.datetime | None = None
     self.iscomplete: bool = False
+    # recycling, see `FramePool`
+    self.pool: FramePool | None = None
+    self.refs: int = 0
+    self._storage: memoryview | None = None # preallocated packet storage of a pooled dataFrame
+    # see `FrameLayout`
+    self.layoutMatched: bool | None = None # None when parsed without layout
+    self._tail: tuple[FrameLayout, int] | None = None # matched layout and offset of its fixed tail in `packet`
+  def reset(self) -> None:
+    """Clear the header and contents, keeping the logger and pool"""
+    self.version = self.totalPacketLen = self.platform = self.frameNumber = self.timeCpuCycles = self.numDetectedObj = self.numTLVs = self.subFrameNumber = None
+    self.numRangeBins = None
+    self.packet = None
+    self.TLVs.clear()
+    self._sections.clear()
+    self.CRC32 = None
+    self.time = None
+    self.iscomplete = False
+    self.layoutMatched = None
+    self._tail = None
+  def retain(self) -> "DataFrame":
+    """Take one more reference of a pooled dataFrame (no effect on other dataFrames)
+
+    Returns:
+      DataFrame: self
+    """
+    if self.pool is not None: 
+      with self.pool.lock: self.refs += 1
+    return self
+  def release(self) -> None:
+    """Drop one reference of a pooled dataFrame, it returns to its pool at zero (no effect on other dataFrames)
+
+    The dataFrame and the arrays decoded from it must not be used after the last release.
+    """
+    if self.pool is not None: self.pool.release(self)
   def detectedPoints(self):
     return self.detectedObjects.detectedPoints()
+  def points_array(self, units: PointUnits | None = None) -> numpy.ndarray:
+    return self.detectedObjects.points_array(units)
+  @property
+  def fixed(self) -> numpy.ndarray | None:
+    """Structured view of the fixed TLVs (`FrameLayout.dtype`), None unless the layout matched"""
+    if self._tail is None: return None
+    layout, index = self._tail
+    return numpy.frombuffer(self.packet, dtype=layout.dtype, count=1, offset=index).reshape(())
+  @property
+  def fingerprint(self) -> int | None:
+    """Cheap identity of the frame contents (CRC32 of the packet), equal for byte-identical frames"""
+    return self.CRC32
+
+  @property
+  def detectedObjects(self) -> DetectedObjects: return self.section(DataFrame.TLV_detectedObjects)
+  @detectedObjects.setter
+  def detectedObjects(self, detectedObjects: DetectedObjects) -> None: self._sections[DataFrame.TLV_detectedObjects] = detectedObjects
+  @property
+  def logMagRange(self) -> LogMagRange: return self.section(DataFrame.TLV_logMagRange)
+  @logMagRange.setter
+  def logMagRange(self, logMagRange: LogMagRange) -> None: self._sections[DataFrame.TLV_logMagRange] = logMagRange
+  @property
+  def noiseProfile(self) -> NoiseProfile: return self.section(DataFrame.TLV_noiseProfile)
+  @noiseProfile.setter
+  def noiseProfile(self, noiseProfile: NoiseProfile) -> None: self._sections[DataFrame.TLV_noiseProfile] = noiseProfile
+  @property
+  def rangeAzimuthHeatMap(self) -> RangeAzimuthHeatMap: return self.section(DataFrame.TLV_rangeAzimuthHeatMap)
+  @rangeAzimuthHeatMap.setter
+  def rangeAzimuthHeatMap(self, rangeAzimuthHeatMap: RangeAzimuthHeatMap) -> None: self._sections[DataFrame.TLV_rangeAzimuthHeatMap] = rangeAzimuthHeatMap
+  @property
+  def rangeDopplerHeatMap(self) -> RangeDopplerHeatMap: return self.section(DataFrame.TLV_rangeDopplerHeatMap)
+  @rangeDopplerHeatMap.setter
+  def rangeDopplerHeatMap(self, rangeDopplerHeatMap: RangeDopplerHeatMap) -> None: self._sections[DataFrame.TLV_rangeDopplerHeatMap] = rangeDopplerHeatMap
+  @property
+  def statsInfo(self) -> StatsInfo: return self.section(DataFrame.TLV_statsInfo)
+  @statsInfo.setter
+  def statsInfo(self, statsInfo: StatsInfo) -> None: self._sections[DataFrame.TLV_statsInfo] = statsInfo
+
+  def section(self, TypeId: int):
+    """Get the contents of a TLV, decoding it from `packet` on first access
+
+    Args:
+      TypeId (int): TLV TypeId
+
+    Returns:
+      object: decoded contents (cached), an empty section if the TLV is not in the frame
+    """
+    section = self._sections.get(TypeId)
+    if section is None:
+      section = self.decode_TLV(TypeId)
+      self._sections[TypeId] = section
+    return section
+
+  def decode_TLV(self, TypeId: int):
+    """Decode the contents of a TLV from `packet` with its registered decoder (see `register_TLV_decoder`)
+
+    Args:
+      TypeId (int): TLV TypeId
+
+    Returns:
+      object: decoded contents, an empty section if the TLV is not in the frame
+    """
+    decoder, empty = DataFrame.TLV_decoders.get(TypeId, (None, None))
+    if decoder is None:
+      if self.log_enable: self.logger.log(event="DataFrame.decode_TLV", level="Warn", message="Error TypeId: {}".format(TypeId))
+      return None
+    if TypeId not in self.TLVs: return empty
+    index, TLV_Length = self.TLVs[TypeId]
+    return decoder(memoryview(self.packet)[index:index+TLV_Length], self)
+
+  TLV_decoders: dict[int, tuple[typing.Callable[[memoryview, "DataFrame"], object], object]] = dict() # TypeId -> (decoder, shared empty section)
+
+  @classmethod
+  def register_TLV_decoder(cls, TypeId: int, decoder: typing.Callable[[memoryview, "DataFrame"], object], empty: typing.Callable[[], object] | None = None) -> None:
+    """Register the decoder of a TLV TypeId, replacing any previous one
+
+    TLVs without a registered decoder are skipped by their Length when parsing.
+
+    Args:
+      TypeId (int): TLV TypeId
+      decoder (Callable[[memoryview, DataFrame], object]): Called with the TLV contents (a view over `packet`) and the dataFrame, returns the decoded contents.
+        Prefer `numpy.frombuffer` or `struct.Struct.unpack_from` over per-element work, the view stays valid as long as the dataFrame.
+      empty (Callable[[], object] | None, optional): Factory of the section returned when the TLV is not in the frame.
+        It is called once, and the section is shared by every frame without the TLV, so it must not be modified. Defaults to None.
+    """
+    cls.TLV_decoders[TypeId] = (decoder, empty() if empty is not None else None)
+
+  @staticmethod
+  def decode_detectedObjects(payload: memoryview, dataFrame: "DataFrame") -> DetectedObjects:
+    detectedObjects = DataFrame.DetectedObjects()
+    # parse detectedObjects header
+    detectedObjects.infomation.numDetetedObj, detectedObjects.infomation.xyzQFormat = DataFrame.detectedInfomationStruct.unpack_from(payload, 0)
+    if dataFrame.log_enable: 
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.detectedObjects.infomation.numDetetedObj: {}".format(detectedObjects.infomation.numDetetedObj)) # TODO: check this with `dataFrame.data.numDetectedObj`
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.detectedObjects.infomation.xyzQFormat   : {}".format(detectedObjects.infomation.xyzQFormat   ))
+    # parse detectedObjects list
+    detectedObjects.array = numpy.frombuffer(payload, dtype=DataFrame.DetectedObjects.dtype, count=min(detectedObjects.infomation.numDetetedObj, (len(payload)-4)//12), offset=DataFrame.detectedInfomationStruct.size)
+    if dataFrame.log_enable: 
+      for DetetedObj_index, (rangeIdx, dopplerIdx, peakVal, x, y, z) in enumerate(detectedObjects.array.tolist()):
+        dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.detectedObjects.Objects[{index:{index_log10}d}]: ({rangeIdx:3d}, {dopplerIdx:3d}, {peakVal:3d}, {x:5d}, {y:5d}, {z:5d}) -> ({xQFormat:8.4f}, {yQFormat:8.4f}, {zQFormat:8.4f})".format(
+          index=DetetedObj_index, 
+          index_log10=int(math.log10(detectedObjects.infomation.numDetetedObj))+1, 
+          rangeIdx=rangeIdx, dopplerIdx=dopplerIdx, peakVal=peakVal, x=x, y=y, z=z, 
+          xQFormat=Converter.QFormat.parse(detectedObjects.infomation.xyzQFormat, x), 
+          yQFormat=Converter.QFormat.parse(detectedObjects.infomation.xyzQFormat, y), 
+          zQFormat=Converter.QFormat.parse(detectedObjects.infomation.xyzQFormat, z)))
+    return detectedObjects
+
+  @staticmethod
+  def decode_logMagRange(payload: memoryview, dataFrame: "DataFrame") -> LogMagRange:
+    logMagRange = DataFrame.LogMagRange()
+    logMagRange.logMagRange = numpy.frombuffer(payload, dtype="<u2", count=len(payload)//2)
+    if dataFrame.log_enable: dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.logMagRange: {}".format(logMagRange.logMagRange.tolist()))
+    return logMagRange
 
   @staticmethod
-  def parse(dataByte: bytearray, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False):
+  def decode_noiseProfile(payload: memoryview, dataFrame: "DataFrame") -> NoiseProfile:
+    noiseProfile = DataFrame.NoiseProfile()
+    noiseProfile.noiseProfile = numpy.frombuffer(payload, dtype="<u2", count=len(payload)//2)
+    if dataFrame.log_enable: dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.noiseProfile: {}".format(noiseProfile.noiseProfile.tolist()))
+    return noiseProfile
+
+  @staticmethod
+  def decode_rangeAzimuthHeatMap(payload: memoryview, dataFrame: "DataFrame") -> RangeAzimuthHeatMap:
+    rangeAzimuthHeatMap = DataFrame.RangeAzimuthHeatMap()
+    numRangeBins = dataFrame.numRangeBins
+    # int16 (imag, real) pairs, viewed in place
+    cmplx16ImRe = numpy.frombuffer(payload, dtype="<i2", count=(len(payload)//4)*2).reshape(-1, 2)
+    rangeAzimuthHeatMap.numRangeBins = numRangeBins
+    if numRangeBins is not None: # TODO: unconfirmed is `numRangeBins` or `numVirtualAntAzim` major
+      numVirtualAntAzim = (len(payload)//4) // numRangeBins
+      rangeAzimuthHeatMap.numVirtualAntAzim = numVirtualAntAzim
+      cmplx16ImRe = cmplx16ImRe[:numRangeBins*numVirtualAntAzim].reshape(numRangeBins, numVirtualAntAzim, 2)
+    rangeAzimuthHeatMap.cmplx16ImRe = cmplx16ImRe
+    rangeAzimuthHeatMap.rangeAzimuthHeatMap = DataFrame.RangeAzimuthHeatMap.complex64(cmplx16ImRe)
+    if dataFrame.log_enable: dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.rangeAzimuthHeatMap: {}".format(str(rangeAzimuthHeatMap)))
+    return rangeAzimuthHeatMap
+
+  @staticmethod
+  def decode_rangeDopplerHeatMap(payload: memoryview, dataFrame: "DataFrame") -> RangeDopplerHeatMap:
+    rangeDopplerHeatMap = DataFrame.RangeDopplerHeatMap()
+    numRangeBins = dataFrame.numRangeBins
+    heatMap = numpy.frombuffer(payload, dtype="<u2", count=len(payload)//2)
+    rangeDopplerHeatMap.numRangeBins = numRangeBins
+    if numRangeBins is not None: # TODO: unconfirmed is `numRangeBins` or `numDopplerBins` major
+      numDopplerBins = (len(payload)//2) // numRangeBins
+      rangeDopplerHeatMap.numDopplerBins = numDopplerBins
+      heatMap = heatMap[:numRangeBins*numDopplerBins].reshape(numRangeBins, numDopplerBins)
+    rangeDopplerHeatMap.rangeDopplerHeatMap = heatMap
+    if dataFrame.log_enable: dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.rangeDopplerHeatMap: {}".format(rangeDopplerHeatMap.rangeDopplerHeatMap.tolist()))
+    return rangeDopplerHeatMap
+
+  @staticmethod
+  def decode_statsInfo(payload: memoryview, dataFrame: "DataFrame") -> StatsInfo:
+    statsInfo = DataFrame.StatsInfo()
+    (statsInfo.interFrameProcessingTime, 
+     statsInfo.transmitOutputTime, 
+     statsInfo.interFrameProcessingMargin, 
+     statsInfo.interChirpProcessingMargin, 
+     statsInfo.activeFrameCPULoad, 
+     statsInfo.interFrameCPULoad) = DataFrame.statsInfoStruct.unpack_from(payload, 0)
+    if dataFrame.log_enable: 
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.statsInfo.interFrameProcessingTime  : {}".format(statsInfo.interFrameProcessingTime  ))
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.statsInfo.transmitOutputTime        : {}".format(statsInfo.transmitOutputTime        ))
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.statsInfo.interFrameProcessingMargin: {}".format(statsInfo.interFrameProcessingMargin))
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.statsInfo.interChirpProcessingMargin: {}".format(statsInfo.interChirpProcessingMargin))
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.statsInfo.activeFrameCPULoad        : {}".format(statsInfo.activeFrameCPULoad        ))
+      dataFrame.logger.log(event="DataFrame.decode_TLV", level="logging", message="DataFrame.statsInfo.interFrameCPULoad         : {}".format(statsInfo.interFrameCPULoad         ))
+    return statsInfo
+
+  @staticmethod
+  def parse(dataByte: bytearray | memoryview, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False, TLV_types: set[int] | None = None, statistics: "ParseStatistics | None" = None):
     """Parse dataByte to get dataFrame
 
     Args:
-      dataByte (bytearray): Parse data sources
+      dataByte (bytearray | memoryview): Parse data sources
       log (bool, optional): Enable logging to log. Defaults to False.
+      TLV_types (set[int] | None, optional): TypeIds to decode, see `parse_packet`. Defaults to None.
+      statistics (ParseStatistics | None, optional): Counters to update. Defaults to None.
+
+    Returns:
+      tuple[DataFrame, int] | tuple[None, None]: first complete dataFrame and the index after it, or (None, None) if no complete dataFrame
     """
 
     if log_enable: logger = Logging.Logger(log_file if log_file is not None else "Log/DataFrame.log", log_echo)
-    dataFrame: DataFrame = DataFrame()
-
-    # Record parsing time
-    dataFrame.time = datetime.datetime.now()
 
     # checke dataByte parse range
     BASE_NUMBER_OF_BITS = 8
@@ -171,8 +487,12 @@ class DataFrame:
     # for startIndex_checker in numpy.where(dataByte == DataFrame.magicBytes[0])[0]:
     for startIndex_checker in numpy.where(dataByte_uint8 == DataFrame.magicBytes[0])[0]:
       # if numpy.all(dataByte_uint8[startIndex_checker:startIndex_checker+len(DataFrame.magicBytes)] == numpy.array(DataFrame.magicBytes, dtype=numpy.uint8)):
-      if numpy.all(dataByte[startIndex_checker:startIndex_checker+len(DataFrame.magicBytes)] == numpy.array(DataFrame.magicBytes, dtype=numpy.uint8)):
-        index = startIndex_checker
+      if startIndex_checker+len(DataFrame.magicBytes) > len(dataByte_uint8): break # partial magicBytes at the end of dataByte
+      if numpy.all(dataByte_uint8[startIndex_checker:startIndex_checker+len(DataFrame.magicBytes)] == numpy.array(DataFrame.magicBytes, dtype=numpy.uint8)):
+        if startIndex_checker + DataFrame.headerLength <= len(dataByte_uint8) and DataFrame.checkHeader(dataByte, int(startIndex_checker)) is not None: # magicBytes inside a payload, not a header
+          if statistics is not None: statistics.resyncs += 1
+          continue
+        index = int(startIndex_checker)
         # add next line to get the first data frame, else to get the last data frame (Wrong: may be incomplete)
         break
 
@@ -181,10 +501,115 @@ class DataFrame:
       if log_enable: logger.log(event="DataFrame.parse", level="Error", message="DataFrame not found")
       return None, None
 
-    if log_enable: logger.log(event="DataFrame.parse", level="logging", message="magicBytes: {}".format(dataByte[index:index+len(DataFrame.magicBytes)]))
-    # print("dataByte: {}".format(dataByte[index:index+len(DataFrame.magicBytes)]))
-    # print("dataByte_uint8: {}".format(dataByte_uint8[index:index+len(DataFrame.magicBytes)]))
-    # print("index: {}/{}".format(index, len(dataByte_uint8)))
+    if log_enable: logger.log(event="DataFrame.parse", level="logging", message="magicBytes: {}".format(bytes(dataByte[index:index+len(DataFrame.magicBytes)])))
+
+    # check header of dataByte is complete
+    if index + DataFrame.headerLength > len(dataByte_uint8):
+      if log_enable: logger.log(event="DataFrame.parse", level="Error", message="DataFrame header is incomplete")
+      if statistics is not None: statistics.incompleteWaits += 1
+      return None, None
+
+    # check length of dataByte is enough
+    # NOTE: when all item of `guiMonitor` is enabled, TLV only can get first 4 items
+    # NOTE: The built-in buffer of serial(use `pyserial-3.5`) is only about 12kB, but rangeAzimuthHeatMap and rangeDopplerHeatMap may each occupy about 8kB
+    totalPacketLen = DataFrame.packetLength(dataByte, index)
+    if index + totalPacketLen > len(dataByte_uint8):
+      if log_enable: logger.log(event="DataFrame.parse", level="Error", message="DataFrame is incomplete (index + total Packet Length > length of dataByte)): {} + {} > {}".format(index, totalPacketLen, len(dataByte_uint8)))
+      if statistics is not None: statistics.incompleteWaits += 1
+      return None, None
+
+    # copy the packet so the dataFrame does not depend on the (reused) receive buffer
+    dataFrame = DataFrame.parse_packet(bytes(dataByte[index:index+totalPacketLen]), log_file, log_echo, log_enable, TLV_types, statistics=statistics)
+    return dataFrame, index+totalPacketLen
+
+  @staticmethod
+  def parse_all(dataByte: bytearray | memoryview, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False, TLV_types: set[int] | None = None, statistics: "ParseStatistics | None" = None):
+    """Parse every complete dataFrame in dataByte in one pass
+
+    Args:
+      dataByte (bytearray | memoryview): Parse data sources
+      log (bool, optional): Enable logging to log. Defaults to False.
+      TLV_types (set[int] | None, optional): TypeIds to decode, see `parse_packet`. Defaults to None.
+      statistics (ParseStatistics | None, optional): Counters to update. Defaults to None.
+
+    Returns:
+      tuple[list[DataFrame], int]: dataFrames in arrival order and the index after the last one (0 if none)
+    """
+    # one forward scan of a throwaway FrameDecoder, instead of searching the rest of dataByte again for every dataFrame
+    dataByte = memoryview(dataByte)
+    decoder = FrameDecoder(max(len(dataByte), 1), log_file, log_echo, log_enable)
+    if statistics is not None: decoder.statistics = statistics
+    decoder.buffer.write(dataByte)
+    index = 0
+    def take(packet: memoryview) -> bytes:
+      nonlocal index
+      index = len(dataByte) - len(decoder.buffer) + len(packet) # the read cursor is at the start of `packet`
+      return bytes(packet)
+    dataFrames: list[DataFrame] = [DataFrame.parse_packet(packet, log_file, log_echo, log_enable, TLV_types, statistics=statistics) for packet in decoder._packets(None, take)]
+    return dataFrames, index
+
+  @staticmethod
+  def packetLength(dataByte: bytes | bytearray | memoryview, index: int = 0) -> int:
+    """Read `totalPacketLen` from the header of the dataFrame starting at `index`
+
+    Args:
+      dataByte (bytes | bytearray | memoryview): Data containing at least the header
+      index (int, optional): Index of the magicBytes. Defaults to 0.
+
+    Returns:
+      int: total packet length in bytes (magicBytes included)
+    """
+    return DataFrame.packetLengthStruct.unpack_from(dataByte, index+12)[0]
+
+  @staticmethod
+  def checkHeader(dataByte: bytes | bytearray | memoryview, index: int = 0, platform: str | None = None, maxPacketLen: int | None = None) -> str | None:
+    """Check the header at `index` against sanity rules before trusting its magicBytes, which can also appear inside heatmap payloads
+
+    Args:
+      dataByte (bytes | bytearray | memoryview): Data containing at least `headerLength` bytes from `index`
+      index (int, optional): Index of the magicBytes. Defaults to 0.
+      platform (str | None, optional): Expected platform, "xWR14xx" or "xWR16xx". Defaults to None, it will accept both.
+      maxPacketLen (int | None, optional): Largest acceptable `totalPacketLen`. Defaults to None, it will use `DataFrame.maxPacketLen`.
+
+    Returns:
+      str | None: the first broken rule, None if the header is plausible
+    """
+    version, totalPacketLen, platformId, frameNumber, timeCpuCycles, numDetectedObj, numTLVs = DataFrame.headerStruct.unpack_from(dataByte, index+len(DataFrame.magicBytes))
+    if version >> 24 not in DataFrame.versionMajors: return "version"
+    platformMask = platformId & 0x0000ff00
+    if platformMask not in DataFrame.platformMasks.values() or (platform is not None and platformMask != DataFrame.platformMasks[platform]): return "platform"
+    if totalPacketLen < DataFrame.headerLength or totalPacketLen > (maxPacketLen if maxPacketLen is not None else DataFrame.maxPacketLen) or totalPacketLen % 32 != 0: return "totalPacketLen"
+    if numTLVs > DataFrame.maxNumTLVs or DataFrame.headerLength + numTLVs*DataFrame.TLVHeaderStruct.size > totalPacketLen: return "numTLVs"
+    if numDetectedObj*DataFrame.DetectedObjects.dtype.itemsize > totalPacketLen: return "numDetectedObj"
+    return None
+
+  @staticmethod
+  def parse_packet(packet: bytes | memoryview, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False, TLV_types: set[int] | None = None, dataFrame: "DataFrame | None" = None, layout: "FrameLayout | None" = None, statistics: "ParseStatistics | None" = None):
+    """Parse one complete dataFrame packet
+
+    Only the header and the TLV headers are read here; the TLV contents are decoded on first access (see `DataFrame.section`).
+    With `TLV_types`, the listed TLVs are decoded here instead, and every other TLV is skipped by its Length and reads as an empty section.
+
+    Args:
+      packet (bytes): Packet bytes, starting with magicBytes and `totalPacketLen` long
+      log (bool, optional): Enable logging to log. Defaults to False.
+      TLV_types (set[int] | None, optional): TypeIds to decode. Defaults to None, it will decode every TLV lazily.
+      dataFrame (DataFrame | None, optional): Empty dataFrame to parse into, e.g. from `FramePool.acquire`. Defaults to None, it will create one.
+      layout (FrameLayout | None, optional): Expected layout, the TLV headers are only walked if the packet does not match it (`layoutMatched`). Defaults to None.
+      statistics (ParseStatistics | None, optional): Counters to update. Defaults to None.
+
+    Returns:
+      DataFrame: parsed dataFrame, `iscomplete` is False if the packet is malformed
+    """
+
+    if log_enable: logger = Logging.Logger(log_file if log_file is not None else "Log/DataFrame.log", log_echo)
+    if dataFrame is None: dataFrame = DataFrame(log_file, log_echo, log_enable)
+
+    # Record parsing time
+    dataFrame.time = datetime.datetime.now()
+    dataFrame.packet = packet
+
+    index: int = 0
 
     # record the dataFrame length
     length = 0
@@ -193,22 +618,19 @@ class DataFrame:
     index += len(DataFrame.magicBytes)
     length += len(DataFrame.magicBytes)
     dataFrame.CRC32 = 0
-    
+
     try:
       # read DataFrame header
-      dataFrame.version         , index = Converter.uint8_2_uint32(dataByte, index)
-      dataFrame.totalPacketLen  , index = Converter.uint8_2_uint32(dataByte, index)
-      dataFrame.platform        , index = Converter.uint8_2_uint32(dataByte, index)
-      dataFrame.frameNumber     , index = Converter.uint8_2_uint32(dataByte, index)
-      dataFrame.timeCpuCycles   , index = Converter.uint8_2_uint32(dataByte, index)
-      dataFrame.numDetectedObj  , index = Converter.uint8_2_uint32(dataByte, index)
-      dataFrame.numTLVs         , index = Converter.uint8_2_uint32(dataByte, index)
-      platform: numpy.uint32 = dataFrame.platform & 0x0000ff00
+      dataFrame.version, dataFrame.totalPacketLen, dataFrame.platform, dataFrame.frameNumber, dataFrame.timeCpuCycles, dataFrame.numDetectedObj, dataFrame.numTLVs = DataFrame.headerStruct.unpack_from(packet, index)
+      platform: int = dataFrame.platform & 0x0000ff00
       if platform == 0x00001600:
-        dataFrame.subFrameNumber  , index = Converter.uint8_2_uint32(dataByte, index)
+        dataFrame.subFrameNumber = DataFrame.headerStruct_xWR16xx.unpack_from(packet, index)[7]
+        index += DataFrame.headerStruct_xWR16xx.size
+      else:
+        index += DataFrame.headerStruct.size
       # if log is not None:
       if log_enable: 
-        logger.log(event="DataFrame.parse", level="logging", message="DataFrame.version       : {}.{}.{}.{}".format(int((dataFrame.version&0xff000000)>>24), int((dataFrame.version&0x00ff0000)>16), int((dataFrame.version&0x0000ff00)>8), int((dataFrame.version&0x000000ff))))
+        logger.log(event="DataFrame.parse", level="logging", message="DataFrame.version       : {}.{}.{}.{}".format(int((dataFrame.version&0xff000000)>>24), int((dataFrame.version&0x00ff0000)>>16), int((dataFrame.version&0x0000ff00)>>8), int((dataFrame.version&0x000000ff))))
         logger.log(event="DataFrame.parse", level="logging", message="DataFrame.totalPacketLen: {}".format(dataFrame.totalPacketLen))
         logger.log(event="DataFrame.parse", level="logging", message="DataFrame.platform      : {}".format(format(dataFrame.platform, 'x')))
         logger.log(event="DataFrame.parse", level="logging", message="DataFrame.frameNumber   : {}".format(dataFrame.frameNumber   ))
@@ -220,174 +642,580 @@ class DataFrame:
       length += 32 if platform == 0x00001600 else 28
       if log_enable: logger.log(event="DataFrame.parse", level="logging", message="length: {}".format(length))
 
-      # check length of dataByte is enough
-      # NOTE: when all item of `guiMonitor` is enabled, TLV only can get first 4 items
-      # NOTE: The built-in buffer of serial(use `pyserial-3.5`) is only about 12kB, but rangeAzimuthHeatMap and rangeDopplerHeatMap may each occupy about 8kB
-      if index + dataFrame.totalPacketLen - len(DataFrame.magicBytes) - length > len(dataByte):
-        if log_enable: logger.log(event="DataFrame.parse", level="Error", message="DataFrame is incomplete (index + total Packet Length - magicBytes length - length > length of dataByte)): {} + {} - {} - {} < {}\n{}".format(index, dataFrame.totalPacketLen, len(DataFrame.magicBytes), (32 if platform == 0x00001600 else 28), len(dataByte), dataByte))
-        return None, None
-
-      # record contents argument
-      numRangeBins:      numpy.uint32 | None = None
-      numVirtualAntAzim: numpy.uint32 | None = None
-      numDopplerBins:    numpy.uint32 | None = None
-
-      # read DataFrame contents
-      for TLV_index in range(dataFrame.numTLVs):
-
-        # read TLV header
-        TLV_TypeId, index = Converter.uint8_2_uint32(dataByte, index)
-        TLV_Length, index = Converter.uint8_2_uint32(dataByte, index) # bytes length of contents
+      # locate the TLVs from the layout, or else read TLV headers, the contents are skipped by Length
+      if layout is not None: 
+        dataFrame.layoutMatched = layout.locate(dataFrame, index, TLV_types)
+        if not dataFrame.layoutMatched: 
+          if statistics is not None: statistics.layoutMismatches += 1
+          if log_enable: logger.log(event="DataFrame.parse", level="Warn", message="dataFrame does not match the configured layout")
+      for TLV_index in range(dataFrame.numTLVs if not dataFrame.layoutMatched else 0):
+        TLV_TypeId, TLV_Length = DataFrame.TLVHeaderStruct.unpack_from(packet, index) # Length: bytes length of contents
+        index += DataFrame.TLVHeaderStruct.size
         if log_enable: 
           logger.log(event="DataFrame.parse", level="logging", message="DataFrame.TLV[{}].TypeId: {}".format(TLV_index, TLV_TypeId))
           logger.log(event="DataFrame.parse", level="logging", message="DataFrame.TLV[{}].Length: {}".format(TLV_index, TLV_Length))
-
-        # parse TLV: detectedObjects
-        if TLV_TypeId == 1:
-          # parse detectedObjects header
-          dataFrame.detectedObjects.infomation.numDetetedObj, index = Converter.uint8_2_uint16(dataByte, index)
-          dataFrame.detectedObjects.infomation.xyzQFormat   , index = Converter.uint8_2_uint16(dataByte, index)
-          if log_enable: 
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.detectedObjects.infomation.numDetetedObj: {}".format(dataFrame.detectedObjects.infomation.numDetetedObj)) # TODO: check this with `dataFrame.data.numDetectedObj`
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.detectedObjects.infomation.xyzQFormat   : {}".format(dataFrame.detectedObjects.infomation.xyzQFormat   ))
-          # parse detectedObjects list
-          dataFrame.detectedObjects.Objects = []
-          for DetetedObj_index in range(dataFrame.detectedObjects.infomation.numDetetedObj):
-            rangeIdx  , index = Converter.uint8_2_uint16(dataByte, index)
-            dopplerIdx, index = Converter.uint8_2_int16(dataByte, index)
-            peakVal   , index = Converter.uint8_2_uint16(dataByte, index)
-            x         , index = Converter.uint8_2_int16(dataByte, index)
-            y         , index = Converter.uint8_2_int16(dataByte, index)
-            z         , index = Converter.uint8_2_int16(dataByte, index)
-            dataFrame.detectedObjects.Objects.append(dataFrame.detectedObjects.DetectedObj(rangeIdx, dopplerIdx, peakVal, x, y, z))
-            if log_enable:  logger.log(event="DataFrame.parse", level="logging", message="DataFrame.detectedObjects.Objects[{index:{index_log10}d}]: ({rangeIdx:3d}, {dopplerIdx:3d}, {peakVal:3d}, {x:5d}, {y:5d}, {z:5d}) -> ({xQFormat:8.4f}, {yQFormat:8.4f}, {zQFormat:8.4f})".format(
-              index=DetetedObj_index, 
-              index_log10=int(math.log10(dataFrame.detectedObjects.infomation.numDetetedObj))+1, 
-              rangeIdx=rangeIdx, dopplerIdx=dopplerIdx, peakVal=peakVal, x=x, y=y, z=z, 
-              xQFormat=Converter.QFormat.parse(dataFrame.detectedObjects.infomation.xyzQFormat, x), 
-              yQFormat=Converter.QFormat.parse(dataFrame.detectedObjects.infomation.xyzQFormat, y), 
-              zQFormat=Converter.QFormat.parse(dataFrame.detectedObjects.infomation.xyzQFormat, z)))
-          # check TLV length
-          if 4 + (dataFrame.detectedObjects.infomation.numDetetedObj * 12) != TLV_Length: 
-            if log_enable: logger.log(event="DataFrame.parse.TLV", level="Warn", message="TLV(`detectedObjects`) length mismatch")
-          length += 8 + 4 + (dataFrame.detectedObjects.infomation.numDetetedObj * 12)
-          # print("index: {}/{}".format(index, len(dataByte_uint8)))
-
-        # parse TLV: logMagRange
-        elif TLV_TypeId == 2:
-          # parse logMagRange
-          dataFrame.logMagRange.logMagRange = list()
-          numRangeBins = TLV_Length//2
-          for _ in range(numRangeBins):
-            _logMagRange, index = Converter.uint8_2_uint16(dataByte, index)
-            dataFrame.logMagRange.logMagRange.append(_logMagRange)
-          if log_enable: logger.log(event="DataFrame.parse", level="logging", message="DataFrame.logMagRange: {}".format(dataFrame.logMagRange.logMagRange))
-          length += 8 + TLV_Length
-          # print("index: {}/{}".format(index, len(dataByte_uint8)))
-
-        # parse TLV: noiseProfile
-        elif TLV_TypeId == 3:
-          dataFrame.noiseProfile.noiseProfile = list()
-          numRangeBins = TLV_Length//2
-          for _ in range(numRangeBins):
-            _noiseProfile, index = Converter.uint8_2_uint16(dataByte, index)
-            dataFrame.noiseProfile.noiseProfile.append(_noiseProfile)
-          if log_enable: logger.log(event="DataFrame.parse", level="logging", message="DataFrame.noiseProfile: {}".format(dataFrame.noiseProfile.noiseProfile))
-          length += 8 + TLV_Length
-          # print("index: {}/{}".format(index, len(dataByte_uint8)))
-
-        # parse TLV: rangeAzimuthHeatMap
-        elif TLV_TypeId == 4:
-          dataFrame.rangeAzimuthHeatMap.rangeAzimuthHeatMap = list()
-          dataFrame.rangeAzimuthHeatMap.numRangeBins = numRangeBins
-          if numRangeBins is not None: # TODO: Restructure this paragraph
-            numVirtualAntAzim = (TLV_Length//4) // numRangeBins
-            dataFrame.rangeAzimuthHeatMap.numVirtualAntAzim = numVirtualAntAzim
-            for _ in range(numRangeBins): # TODO: unconfirmed is `numRangeBins` or `numVirtualAntAzim`
-              _numRangeBins = list()
-              for _ in range(numVirtualAntAzim): # TODO: unconfirmed is `numRangeBins` or `numVirtualAntAzim`
-                imag, index = Converter.uint8_2_int16(dataByte, index)
-                real, index = Converter.uint8_2_int16(dataByte, index)
-                _numRangeBins.append(DataFrame.RangeAzimuthHeatMap.Cmplx16ImRe(imag, real))
-              dataFrame.rangeAzimuthHeatMap.rangeAzimuthHeatMap.append(copy.deepcopy(_numRangeBins))
-          else:
-            for _ in range(TLV_Length//4):
-              imag, index = Converter.uint8_2_int16(dataByte, index)
-              real, index = Converter.uint8_2_int16(dataByte, index)
-              dataFrame.rangeAzimuthHeatMap.rangeAzimuthHeatMap.append(DataFrame.RangeAzimuthHeatMap.Cmplx16ImRe(imag, real))
-          if log_enable: logger.log(event="DataFrame.parse", level="logging", message="DataFrame.rangeAzimuthHeatMap: {}".format(str(dataFrame.rangeAzimuthHeatMap)))
-          length += 8 + TLV_Length
-          # print("index: {}/{}".format(index, len(dataByte_uint8)))
-
-        # parse TLV: rangeDopplerHeatMap
-        elif TLV_TypeId == 5:
-          dataFrame.rangeDopplerHeatMap.rangeDopplerHeatMap = list()
-          dataFrame.rangeDopplerHeatMap.numRangeBins = numRangeBins
-          if numRangeBins is not None: # TODO: Restructure this paragraph
-            numDopplerBins = (TLV_Length//2) // numRangeBins
-            dataFrame.rangeDopplerHeatMap.numDopplerBins = numDopplerBins
-            for _ in range(numRangeBins): # TODO: unconfirmed is `numRangeBins` or `numDopplerBins`
-              _numRangeBins = list()
-              for _ in range(numDopplerBins): # TODO: unconfirmed is `numRangeBins` or `numDopplerBins`
-                _rangeDopplerHeatMap, index = Converter.uint8_2_uint16(dataByte, index)
-                _numRangeBins.append(_rangeDopplerHeatMap)
-              dataFrame.rangeDopplerHeatMap.rangeDopplerHeatMap.append(copy.deepcopy(_numRangeBins))
-          else:
-            for _ in range(TLV_Length//4):
-              _rangeDopplerHeatMap, index = Converter.uint8_2_uint16(dataByte, index)
-              dataFrame.rangeDopplerHeatMap.rangeDopplerHeatMap.append(_rangeDopplerHeatMap)
-          if log_enable: logger.log(event="DataFrame.parse", level="logging", message="DataFrame.rangeDopplerHeatMap: {}".format(dataFrame.rangeDopplerHeatMap.rangeDopplerHeatMap))
-          length += 8 + TLV_Length
-          # print("index: {}/{}".format(index, len(dataByte_uint8)))
-
-        # parse TLV: statsInfo
-        elif TLV_TypeId == 6:
-          dataFrame.statsInfo.interFrameProcessingTime  , index = Converter.uint8_2_uint32(dataByte, index)
-          dataFrame.statsInfo.transmitOutputTime        , index = Converter.uint8_2_uint32(dataByte, index)
-          dataFrame.statsInfo.interFrameProcessingMargin, index = Converter.uint8_2_uint32(dataByte, index)
-          dataFrame.statsInfo.interChirpProcessingMargin, index = Converter.uint8_2_uint32(dataByte, index)
-          dataFrame.statsInfo.activeFrameCPULoad        , index = Converter.uint8_2_uint32(dataByte, index)
-          dataFrame.statsInfo.interFrameCPULoad         , index = Converter.uint8_2_uint32(dataByte, index)
-          if log_enable: 
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.statsInfo.interFrameProcessingTime  : {}".format(dataFrame.statsInfo.interFrameProcessingTime  ))
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.statsInfo.transmitOutputTime        : {}".format(dataFrame.statsInfo.transmitOutputTime        ))
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.statsInfo.interFrameProcessingMargin: {}".format(dataFrame.statsInfo.interFrameProcessingMargin))
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.statsInfo.interChirpProcessingMargin: {}".format(dataFrame.statsInfo.interChirpProcessingMargin))
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.statsInfo.activeFrameCPULoad        : {}".format(dataFrame.statsInfo.activeFrameCPULoad        ))
-            logger.log(event="DataFrame.parse", level="logging", message="DataFrame.statsInfo.interFrameCPULoad         : {}".format(dataFrame.statsInfo.interFrameCPULoad         ))
-          length += 8 + TLV_Length
-          # print("index: {}/{}".format(index, len(dataByte_uint8)))
-
-        # deal with padding
-        # Note that the padding is not in the TLV
-        # # elif TLV_TypeId & 0x000000ff == 0x00000000:
-        # elif dataByte[index-8] == 0x00:
-        #   index -= 8
-        #   while dataByte[index] == 0x00:
-        #     index += 1
-        #     length += 1
-        #   break
-
-        else: 
+        if index + TLV_Length > dataFrame.totalPacketLen: raise ValueError("DataFrame.TLV[{}] exceeds totalPacketLen: {} + {} > {}".format(TLV_index, index, TLV_Length, dataFrame.totalPacketLen))
+        if TLV_TypeId not in DataFrame.TLV_decoders: # unknown TLV, skipped
+          if statistics is not None: statistics.unknownTLVs += 1
           if log_enable: logger.log(event="DataFrame.parse", level="Warn", message="Error TypeId: {}".format(TLV_TypeId))
-
-      # print("index: {}/{}".format(index, len(dataByte_uint8)))
+        elif TLV_types is None or TLV_TypeId in TLV_types:
+          dataFrame.TLVs[TLV_TypeId] = (index, TLV_Length)
+        # record contents argument
+        if dataFrame.numRangeBins is None and (TLV_TypeId == DataFrame.TLV_logMagRange or TLV_TypeId == DataFrame.TLV_noiseProfile): dataFrame.numRangeBins = TLV_Length//2
+        # check TLV length
+        if TLV_TypeId == DataFrame.TLV_detectedObjects and 4 + (dataFrame.numDetectedObj * 12) != TLV_Length: 
+          if statistics is not None: statistics.lengthMismatches += 1
+          if log_enable: logger.log(event="DataFrame.parse.TLV", level="Warn", message="TLV(`detectedObjects`) length mismatch")
+        index += TLV_Length
+        length += 8 + TLV_Length
 
       # check dataFrame length is match (need to count parsed bytes from dataByte)
       # Note that padding may not be as expected
       # if dataFrame.totalPacketLen != length:
-      #   logger.log(event="DataFrame.parse", level="Warn", message="dataFrame length mismatch (totalPacketLen != length): {} != {}\n{}".format(dataFrame.totalPacketLen, length, dataByte[index-(dataFrame.totalPacketLen-length):index-length+dataFrame.totalPacketLen]))
+      #   logger.log(event="DataFrame.parse", level="Warn", message="dataFrame length mismatch (totalPacketLen != length): {} != {}".format(dataFrame.totalPacketLen, length))
 
       # CRC32 checksum
-      CRC_index = index-length
-      while CRC_index < index-length+dataFrame.totalPacketLen:
-        tmp, CRC_index = Converter.uint8_2_uint32(dataByte, CRC_index)
-        dataFrame.CRC32 += tmp
+      if len(packet) < dataFrame.totalPacketLen: raise ValueError("packet is shorter than totalPacketLen: {} < {}".format(len(packet), dataFrame.totalPacketLen))
+      dataFrame.CRC32 = zlib.crc32(memoryview(packet)[:dataFrame.totalPacketLen])
+
+      # decode the declared TLVs now
+      if TLV_types is not None:
+        for TLV_TypeId in dataFrame.TLVs: dataFrame.section(TLV_TypeId)
+
+      # is complete DataFrame
+      dataFrame.iscomplete = True
+      if statistics is not None: statistics.framesParsed += 1
     except Exception as exception:
       if log_enable: logger.log(event="DataFrame.parse", level="Warn", message="Error: {}".format(exception))
       dataFrame.CRC32 = 0
-    
-    # is complete DataFrame
-    dataFrame.iscomplete = True if dataFrame.CRC32 != 0 else False
+      dataFrame.iscomplete = False
+      if statistics is not None: statistics.integrityFailures += 1
+
+    return dataFrame
+
+# TLVs defined by SDK 2.1
+DataFrame.register_TLV_decoder(DataFrame.TLV_detectedObjects,     DataFrame.decode_detectedObjects,     DataFrame.DetectedObjects)
+DataFrame.register_TLV_decoder(DataFrame.TLV_logMagRange,         DataFrame.decode_logMagRange,         DataFrame.LogMagRange)
+DataFrame.register_TLV_decoder(DataFrame.TLV_noiseProfile,        DataFrame.decode_noiseProfile,        DataFrame.NoiseProfile)
+DataFrame.register_TLV_decoder(DataFrame.TLV_rangeAzimuthHeatMap, DataFrame.decode_rangeAzimuthHeatMap, DataFrame.RangeAzimuthHeatMap)
+DataFrame.register_TLV_decoder(DataFrame.TLV_rangeDopplerHeatMap, DataFrame.decode_rangeDopplerHeatMap, DataFrame.RangeDopplerHeatMap)
+DataFrame.register_TLV_decoder(DataFrame.TLV_statsInfo,           DataFrame.decode_statsInfo,           DataFrame.StatsInfo)
 
-    return dataFrame, index-length+dataFrame.totalPacketLen
\ No newline at end of file
+# shared frame without contents, e.g. before the first frame is received; it must not be modified
+DataFrame.emptyFrame = DataFrame()
+
+# %%
+class ParseStatistics:
+  """Always-on parse counters, cheap enough to keep in production instead of text logging"""
+  __slots__ = ("framesParsed", "incompleteWaits", "resyncs", "bytesDiscarded", "framesSkipped", "unknownTLVs", "lengthMismatches", "layoutMismatches", "integrityFailures")
+  def __init__(self) -> None:
+    self.reset()
+  def reset(self) -> None:
+    self.framesParsed:      int = 0 # complete dataFrames
+    self.incompleteWaits:   int = 0 # passes that stopped on a partial header or packet
+    self.resyncs:           int = 0 # magicBytes rejected by `DataFrame.checkHeader`
+    self.bytesDiscarded:    int = 0 # bytes dropped without being parsed (no magicBytes, rejected sync points, buffer overflow, skipped by `latest`)
+    self.framesSkipped:     int = 0 # complete dataFrames dropped by `FrameDecoder.latest`
+    self.unknownTLVs:       int = 0 # TLVs without a registered decoder
+    self.lengthMismatches:  int = 0 # detectedObjects TLV length not matching numDetectedObj
+    self.layoutMismatches:  int = 0 # dataFrames not matching the configured `FrameLayout`
+    self.integrityFailures: int = 0 # malformed dataFrames (`iscomplete` is False)
+  def snapshot(self) -> dict[str, int]:
+    """Get the counters as a dict"""
+    return {name: getattr(self, name) for name in ParseStatistics.__slots__}
+
+# %%
+class FrameNumberTracker:
+  """Continuity of `DataFrame.frameNumber`: dropped, duplicated and reordered frames, and a rolling drop rate
+
+  Gaps are the first sign that the UART or the host cannot keep up (note that `FrameDecoder.latest` skips frames on purpose, they are counted as dropped here too).
+  """
+  __slots__ = ("window", "maxReorder", "on_gap", "lastFrameNumber", "framesReceived", "framesDropped", "duplicates", "reordered", "restarts", "callbackErrors", "callbackError", "_missed", "_missedSum")
+  def __init__(self, window: int = 100, on_gap: typing.Callable[[int, int, int], None] | None = None, maxReorder: int = 8) -> None:
+    """Initialize FrameNumberTracker
+
+    Args:
+      window (int, optional): Received frames covered by `dropRate`. Defaults to 100.
+      on_gap (Callable[[int, int, int], None] | None, optional): Called with (expected frameNumber, received frameNumber, missed frames) on every gap, from the parsing thread; it should return quickly, exceptions are counted in `callbackErrors`. Defaults to None.
+      maxReorder (int, optional): Largest backward jump counted as reordered, a larger one is a restart of the frameNumbers (e.g. sensorStart whose first frames were lost). Defaults to 8.
+    """
+    self.window: int = window
+    self.maxReorder: int = maxReorder
+    self.on_gap: typing.Callable[[int, int, int], None] | None = on_gap
+    self.callbackErrors: int = 0 # `on_gap` calls that raised
+    self.callbackError: Exception | None = None # last exception raised by `on_gap`
+    self.reset()
+  def restart(self) -> None:
+    """Forget the last frameNumber (e.g. at sensorStart) and keep the counters"""
+    self.lastFrameNumber = None
+  def reset(self) -> None:
+    self.lastFrameNumber: int | None = None
+    self.framesReceived:  int = 0
+    self.framesDropped:   int = 0
+    self.duplicates:      int = 0
+    self.reordered:       int = 0
+    self.restarts:        int = 0
+    self._missed: collections.deque[int] = collections.deque(maxlen=self.window) # missed frames before each of the last `window` received frames
+    self._missedSum: int = 0
+
+  def update(self, frameNumber: int) -> int:
+    """Account a received frameNumber
+
+    Args:
+      frameNumber (int): `DataFrame.frameNumber` of a complete dataFrame
+
+    Returns:
+      int: frames missed right before this one
+    """
+    last = self.lastFrameNumber
+    missed = 0
+    if last is not None and frameNumber == last: 
+      self.duplicates += 1
+      return 0
+    if last is not None and frameNumber < last:
+      if frameNumber > 1 and last - frameNumber <= self.maxReorder: 
+        self.reordered += 1
+        return 0
+      self.restarts += 1
+      last = None # frameNumber restarts from 1 after sensorStart
+    if last is not None and frameNumber > last + 1:
+      missed = frameNumber - last - 1
+      self.framesDropped += missed
+      if self.on_gap is not None: 
+        try: self.on_gap(last + 1, frameNumber, missed)
+        except Exception as exception:
+          self.callbackErrors += 1
+          self.callbackError = exception
+    self.lastFrameNumber = frameNumber
+    self.framesReceived += 1
+    if len(self._missed) == self.window: self._missedSum -= self._missed[0]
+    self._missed.append(missed)
+    self._missedSum += missed
+    return missed
+
+  @property
+  def dropRate(self) -> float:
+    """Fraction of frames missed over the last `window` received frames"""
+    total = len(self._missed) + self._missedSum
+    return self._missedSum / total if total > 0 else 0.0
+
+  def snapshot(self) -> dict[str, int | float]:
+    """Get the counters as a dict"""
+    return {"framesReceived": self.framesReceived, "framesDropped": self.framesDropped, "duplicates": self.duplicates, "reordered": self.reordered, "restarts": self.restarts, "gapCallbackErrors": self.callbackErrors, "dropRate": self.dropRate}
+
+# %%
+class FrameLayout:
+  """Expected TLV layout of the dataFrames produced by one configuration
+
+  Every TLV but detectedObjects has a size fixed by the configuration, and the demo sends them in TypeId order after detectedObjects.
+  The TLVs after detectedObjects (the fixed tail) are compiled into an offset map and a structured dtype, so a dataFrame is checked with one precompiled unpack of its TLV headers and decoded as views, without walking the TLV headers.
+  """
+  def __init__(self, headerLength: int, guiMonitor: tuple[bool, bool, bool, bool, bool, bool], numRangeBins: int, numDopplerBins: int, numVirtualAntAzim: int) -> None:
+    """Initialize FrameLayout
+
+    Args:
+      headerLength (int): Bytes of magicBytes and header, 36 on xWR14xx and 40 on xWR16xx
+      guiMonitor (tuple[bool, bool, bool, bool, bool, bool]): Enabled TLVs, in `guiMonitor` order (detectedObjects, logMagRange, noiseProfile, rangeAzimuthHeatMap, rangeDopplerHeatMap, statsInfo)
+      numRangeBins (int): Range FFT size
+      numDopplerBins (int): Doppler FFT size
+      numVirtualAntAzim (int): Virtual antennas used for azimuth
+    """
+    self.headerLength: int = headerLength
+    self.detectedObjects: bool = bool(guiMonitor[0])
+    self.numRangeBins: int = int(numRangeBins)
+    self.numDopplerBins: int = int(numDopplerBins)
+    self.numVirtualAntAzim: int = int(numVirtualAntAzim)
+    contents: dict[int, tuple[str, numpy.dtype]] = {
+      DataFrame.TLV_logMagRange:         ("logMagRange",         numpy.dtype(("<u2", (self.numRangeBins,)))),
+      DataFrame.TLV_noiseProfile:        ("noiseProfile",        numpy.dtype(("<u2", (self.numRangeBins,)))),
+      DataFrame.TLV_rangeAzimuthHeatMap: ("rangeAzimuthHeatMap", numpy.dtype(("<i2", (self.numRangeBins, self.numVirtualAntAzim, 2)))),
+      DataFrame.TLV_rangeDopplerHeatMap: ("rangeDopplerHeatMap", numpy.dtype(("<u2", (self.numRangeBins, self.numDopplerBins)))),
+      DataFrame.TLV_statsInfo:           ("statsInfo",           numpy.dtype([(name, "<u4") for name in ("interFrameProcessingTime", "transmitOutputTime", "interFrameProcessingMargin", "interChirpProcessingMargin", "activeFrameCPULoad", "interFrameCPULoad")])),
+    }
+    fields: list[tuple] = []
+    headers: list[int] = [] # expected (TypeId, Length) words of the tail
+    self.offsets: dict[int, tuple[int, int]] = dict() # TypeId -> (offset in the tail, Length) of the TLV contents
+    offset = 0
+    for TypeId, enabled in zip(range(DataFrame.TLV_logMagRange, DataFrame.TLV_statsInfo+1), guiMonitor[1:]):
+      if not enabled: continue
+      name, dtype = contents[TypeId]
+      fields.append((name+"TLV", [("TypeId", "<u4"), ("Length", "<u4")]))
+      fields.append((name, dtype))
+      headers += [TypeId, dtype.itemsize]
+      offset += DataFrame.TLVHeaderStruct.size
+      self.offsets[TypeId] = (offset, dtype.itemsize)
+      offset += dtype.itemsize
+    self.dtype: numpy.dtype = numpy.dtype(fields) # fixed tail, starting right after detectedObjects
+    self.tailLength: int = self.dtype.itemsize
+    self.numTLVs: int = len(self.offsets) # not counting detectedObjects
+    # the tail TLV headers, unpacked at once by skipping the contents
+    self._headers: tuple[int, ...] = tuple(headers)
+    self._headersStruct: struct.Struct = struct.Struct("<" + "".join("2I{}x".format(self.offsets[TypeId][1]) for TypeId in self.offsets))
+
+  @staticmethod
+  def compile(config) -> "FrameLayout | None":
+    """Compile the layout of a configuration
+
+    Args:
+      config (Configuration.Configuration_2_1_0): Parsed configuration
+
+    Returns:
+      FrameLayout | None: layout, None if `guiMonitor` or the profile is not configured yet
+    """
+    guiMonitor = config.command.guiMonitor
+    parameter = config.parameter
+    flags = (guiMonitor.detectedObjects, guiMonitor.logMagnitudeRange, guiMonitor.noiseProfile, guiMonitor.rangeAzimuthHeatMap, guiMonitor.rangeDopplerHeatMap, guiMonitor.statsInfo)
+    if None in flags or parameter.numRangeBins is None or parameter.numDopplerBins is None or parameter.numRxAnt is None: return None
+    # azimuth uses the two azimuth Tx (xWR14xx with 3 Tx sends the elevation Tx separately)
+    numVirtualAntAzim = parameter.numRxAnt * min(parameter.numTxAnt, 2)
+    headerLength = 40 if config.platform == "xWR16xx" else 36
+    return FrameLayout(headerLength, tuple(flag == 1 for flag in flags), parameter.numRangeBins, parameter.numDopplerBins, numVirtualAntAzim)
+
+  def locate(self, dataFrame: DataFrame, index: int, TLV_types: set[int] | None = None) -> bool:
+    """Fill `dataFrame.TLVs` from the layout if the packet matches it
+
+    Args:
+      dataFrame (DataFrame): dataFrame with `packet` and header parsed
+      index (int): Offset of the first TLV header in `packet`
+      TLV_types (set[int] | None, optional): TypeIds to record, see `DataFrame.parse_packet`. Defaults to None.
+
+    Returns:
+      bool: whether the packet matches the layout; if not, `dataFrame.TLVs` is left untouched
+    """
+    packet = dataFrame.packet
+    numTLVs = self.numTLVs
+    if index != self.headerLength: return False
+    detectedObjects = None
+    if self.detectedObjects and dataFrame.numDetectedObj > 0:
+      TLV_TypeId, TLV_Length = DataFrame.TLVHeaderStruct.unpack_from(packet, index)
+      if TLV_TypeId != DataFrame.TLV_detectedObjects or TLV_Length != DataFrame.detectedInfomationStruct.size + DataFrame.DetectedObjects.dtype.itemsize*dataFrame.numDetectedObj: return False
+      index += DataFrame.TLVHeaderStruct.size
+      detectedObjects = (index, TLV_Length)
+      index += TLV_Length
+      numTLVs += 1
+    if dataFrame.numTLVs != numTLVs or index + self.tailLength > dataFrame.totalPacketLen: return False
+    if self._headersStruct.unpack_from(packet, index) != self._headers: return False
+    if self.tailLength > 0: dataFrame._tail = (self, index)
+    if detectedObjects is not None and (TLV_types is None or DataFrame.TLV_detectedObjects in TLV_types): dataFrame.TLVs[DataFrame.TLV_detectedObjects] = detectedObjects
+    for TypeId, (offset, TLV_Length) in self.offsets.items():
+      if TLV_types is None or TypeId in TLV_types: dataFrame.TLVs[TypeId] = (index + offset, TLV_Length)
+    dataFrame.numRangeBins = self.numRangeBins
+    return True
+
+# %%
+class FramePool:
+  """Preallocated dataFrames recycled by reference counting
+
+  Every pooled dataFrame owns a `packetCapacity` bytes storage, the packet is copied into it and the decoded arrays are views over it, so a steady stream of frames allocates no packet memory.
+  `acquire` hands out a dataFrame with one reference, `DataFrame.retain`/`DataFrame.release` count the holders and the last release returns it to the pool.
+  When the pool is empty (or a packet exceeds `packetCapacity`) a plain dataFrame is allocated instead and counted in `misses`.
+  """
+  def __init__(self, size: int, packetCapacity: int, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False) -> None:
+    """Initialize FramePool
+
+    Args:
+      size (int): Number of preallocated dataFrames
+      packetCapacity (int): Storage size of every dataFrame in bytes, see `packetCapacity_from_parameter`
+    """
+    if size <= 0: raise ValueError("`size` must be positive: {size}".format(size=size))
+    self.size: int = size
+    self.packetCapacity: int = packetCapacity
+    self.log_file = log_file
+    self.log_echo = log_echo
+    self.log_enable = log_enable
+    self.lock = threading.Lock() # guards `refs` of the pooled dataFrames and `_free`
+    self._free: list[DataFrame] = [self._allocate() for _ in range(size)]
+    self.misses: int = 0 # dataFrames allocated because the pool was empty or too small
+
+  def _allocate(self) -> DataFrame:
+    dataFrame = DataFrame(self.log_file, self.log_echo, self.log_enable)
+    dataFrame.pool = self
+    dataFrame._storage = memoryview(bytearray(self.packetCapacity))
+    return dataFrame
+
+  @staticmethod
+  def packetCapacity_from_parameter(parameter, maxDetectedObj: int = 100) -> int | None:
+    """Size of the largest dataFrame the configuration can produce, with every TLV enabled
+
+    Args:
+      parameter (Configuration.Configuration_2_1_0.Parameter): Parsed configuration parameters
+      maxDetectedObj (int, optional): Detected objects to reserve room for. Defaults to 100.
+
+    Returns:
+      int | None: packet size in bytes, None if the profile is not configured yet
+    """
+    if parameter.numRangeBins is None or parameter.numDopplerBins is None or parameter.numVirtualAntennas is None: return None
+    numRangeBins = int(parameter.numRangeBins)
+    packetCapacity = DataFrame.headerLength + 6*DataFrame.TLVHeaderStruct.size
+    packetCapacity += DataFrame.detectedInfomationStruct.size + DataFrame.DetectedObjects.dtype.itemsize*maxDetectedObj # detectedObjects
+    packetCapacity += 2*numRangeBins * 2 # logMagRange, noiseProfile
+    packetCapacity += 4*numRangeBins*int(parameter.numVirtualAntennas) # rangeAzimuthHeatMap
+    packetCapacity += 2*numRangeBins*int(parameter.numDopplerBins) # rangeDopplerHeatMap
+    packetCapacity += DataFrame.statsInfoStruct.size # statsInfo
+    return (packetCapacity + 31) // 32 * 32 # packets are padded to 32 bytes
+
+  @staticmethod
+  def from_parameter(parameter, size: int, maxDetectedObj: int = 100, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False) -> "FramePool | None":
+    """Build a pool sized for the configuration, None if the profile is not configured yet"""
+    packetCapacity = FramePool.packetCapacity_from_parameter(parameter, maxDetectedObj)
+    if packetCapacity is None: return None
+    return FramePool(size, packetCapacity, log_file, log_echo, log_enable)
+
+  @property
+  def available(self) -> int:
+    """Number of dataFrames ready to be acquired"""
+    return len(self._free)
+
+  def acquire(self, packetLen: int) -> DataFrame:
+    """Get an empty dataFrame whose `packet` is a writable window of `packetLen` bytes
+
+    Args:
+      packetLen (int): Packet size in bytes
+
+    Returns:
+      DataFrame: dataFrame holding one reference, pooled unless the pool is empty or `packetLen` exceeds `packetCapacity`
+    """
+    dataFrame = None
+    if packetLen <= self.packetCapacity:
+      with self.lock:
+        if self._free: 
+          dataFrame = self._free.pop()
+          dataFrame.refs = 1
+    if dataFrame is None:
+      self.misses += 1
+      dataFrame = DataFrame(self.log_file, self.log_echo, self.log_enable)
+      dataFrame.packet = memoryview(bytearray(packetLen))
+      return dataFrame
+    dataFrame.packet = dataFrame._storage[:packetLen]
+    return dataFrame
+
+  def release(self, dataFrame: DataFrame) -> None:
+    """Drop one reference of `dataFrame` (see `DataFrame.release`)"""
+    with self.lock:
+      dataFrame.refs -= 1
+      if dataFrame.refs > 0: return
+      if dataFrame.refs < 0: raise RuntimeError("DataFrame released more often than acquired/retained")
+    dataFrame.reset()
+    with self.lock: self._free.append(dataFrame)
+
+# %%
+class FrameDecoder:
+  """Incremental dataFrame decoder
+
+  Chunks are appended with `feed` (or read straight into `buffer`), and complete dataFrames are returned as soon as their last byte arrives.
+  Bytes searched without finding magicBytes are dropped (except a possible partial magicBytes) and the `totalPacketLen` of the pending header is remembered, so bytes are never searched twice.
+  """
+  skipWalk: int = 16 # stale dataFrames counted one by one by `latest`
+
+  def __init__(self, capacity: int = 131072, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False, TLV_types: set[int] | None = None, pool: FramePool | None = None, platform: str | None = None) -> None:
+    """Initialize FrameDecoder
+
+    Args:
+      capacity (int, optional): Receive buffer size in bytes, must hold the largest dataFrame. Defaults to 131072.
+      TLV_types (set[int] | None, optional): TypeIds to decode, see `DataFrame.parse_packet`. Defaults to None.
+      pool (FramePool | None, optional): Pool to copy packets into by `frames`/`latest_frame`/`decode`. Defaults to None, it will allocate every dataFrame.
+      platform (str | None, optional): Expected platform, headers of another platform are rejected (see `DataFrame.checkHeader`). Defaults to None.
+    """
+    self.TLV_types: set[int] | None = TLV_types
+    self.pool: FramePool | None = pool
+    self.layout: FrameLayout | None = None # expected layout, see `DataFrame.parse_packet`
+    self.platform: str | None = platform
+    self.log_file = log_file
+    self.log_echo = log_echo
+    self.log_enable = log_enable
+    if self.log_enable: self.logger = Logging.Logger(log_file if log_file is not None else "Log/DataFrame.log", log_echo)
+    self.buffer: RingBuffer.RingBuffer = RingBuffer.RingBuffer(capacity)
+    self._synced: bool = False # magicBytes are at the read cursor
+    self._packetLen: int | None = None # `totalPacketLen` of the pending header
+    self._discarded: int = 0 # `buffer.discarded` seen by the decoder
+    self.skippedFrames: int = 0 # dataFrames dropped by `latest` (estimated past `skipWalk` per call)
+    self.skippedBytes: int = 0 # bytes dropped by `latest`
+    self.statistics: ParseStatistics = ParseStatistics()
+    self.frameNumbers: FrameNumberTracker = FrameNumberTracker()
+
+  def reset(self) -> None:
+    """Drop buffered bytes and the pending header"""
+    self.buffer.clear()
+    self._synced = False
+    self._packetLen = None
+    self._discarded = self.buffer.discarded
+
+  def _resync(self) -> None:
+    """Reject the magicBytes at the read cursor and search again after them"""
+    self.statistics.resyncs += 1
+    self.statistics.bytesDiscarded += 1
+    self.buffer.consume(1)
+    self._synced = False
+    self._packetLen = None
+
+  def packets(self, limit: int | None = None) -> list[bytes]:
+    """Split complete dataFrame packets off the buffer
+
+    Args:
+      limit (int | None, optional): Maximum number of packets. Defaults to None, it will return all complete packets.
+
+    Returns:
+      list[bytes]: packets starting with magicBytes, each `totalPacketLen` long
+    """
+    return self._packets(limit, bytes)
+
+  def frames(self, limit: int | None = None) -> list[DataFrame]:
+    """Split complete dataFrame packets off the buffer into (not yet parsed) dataFrames from `pool`
+
+    The copy out of the buffer is all that happens here, so the caller can release its lock before `DataFrame.parse_packet(dataFrame.packet, dataFrame=dataFrame)`.
+
+    Args:
+      limit (int | None, optional): Maximum number of dataFrames. Defaults to None, it will return all complete dataFrames.
+
+    Returns:
+      list[DataFrame]: dataFrames whose `packet` is set, in arrival order
+    """
+    return self._packets(limit, self._take)
+
+  def _take(self, view: memoryview) -> DataFrame:
+    """Copy a packet into a dataFrame from `pool` (or a new one without pool)"""
+    if self.pool is None:
+      dataFrame = DataFrame(self.log_file, self.log_echo, self.log_enable)
+      dataFrame.packet = bytes(view)
+    else:
+      dataFrame = self.pool.acquire(len(view))
+      dataFrame.packet[:] = view
+    return dataFrame
+
+  def _packets(self, limit: int | None, take: typing.Callable[[memoryview], object]) -> list:
+    packets: list = []
+    self._sync_discarded()
+    while limit is None or len(packets) < limit:
+      # find the location of magicBytes
+      if not self._synced:
+        position = self.buffer.find(DataFrame.magicPattern)
+        if position < 0:
+          # keep a possible partial magicBytes at the end
+          drop = max(0, len(self.buffer) - (len(DataFrame.magicPattern) - 1))
+          self.buffer.consume(drop)
+          self.statistics.bytesDiscarded += drop
+          if drop > 0 and self.log_enable: self.logger.log(event="FrameDecoder.packets", level="Warn", message="skip {} bytes without magicBytes".format(drop))
+          break
+        self.buffer.consume(position)
+        self.statistics.bytesDiscarded += position
+        self._synced = True
+      # read the header
+      if self._packetLen is None:
+        if len(self.buffer) < DataFrame.headerLength: 
+          self.statistics.incompleteWaits += 1
+          break
+        header = self.buffer.view(0, DataFrame.headerLength)
+        invalid = DataFrame.checkHeader(header, 0, self.platform, self.buffer.capacity)
+        if invalid is not None: # magicBytes inside a payload, search again after them
+          if self.log_enable: self.logger.log(event="FrameDecoder.packets", level="Warn", message="invalid header: {}".format(invalid))
+          self._resync()
+          continue
+        self._packetLen = DataFrame.packetLength(header)
+      # wait for the whole packet
+      if len(self.buffer) < self._packetLen: 
+        self.statistics.incompleteWaits += 1
+        break
+      packets.append(take(self.buffer.view(0, self._packetLen)))
+      self.buffer.consume(self._packetLen)
+      self._synced = False
+      self._packetLen = None
+    return packets
+
+  def latest(self) -> bytes | None:
+    """Split off the newest complete dataFrame packet and drop everything before it
+
+    The buffer is searched backwards from the end, and only the first `skipWalk` stale dataFrames are counted one by one (the rest is estimated), so the cost does not depend on how many stale dataFrames are queued.
+    Bytes after the newest complete dataFrame (an incomplete one) are kept.
+    Dropped dataFrames and bytes are added to `skippedFrames` and `skippedBytes`.
+
+    Returns:
+      bytes | None: packet of the newest complete dataFrame, or None if there is none
+    """
+    return self._latest(bytes)
+
+  def latest_frame(self) -> DataFrame | None:
+    """`latest` into a (not yet parsed) dataFrame from `pool`, see `frames`
+
+    Returns:
+      DataFrame | None: dataFrame whose `packet` is set, or None if there is no complete dataFrame
+    """
+    return self._latest(self._take)
+
+  def _sync_discarded(self) -> None:
+    """Account the bytes dropped by a buffer overflow, the pending header is lost with them"""
+    if self.buffer.discarded != self._discarded:
+      self.statistics.bytesDiscarded += self.buffer.discarded - self._discarded
+      self._discarded = self.buffer.discarded
+      self._synced = False
+      self._packetLen = None
+
+  def _latest(self, take: typing.Callable[[memoryview], object]):
+    self._sync_discarded()
+    stop = len(self.buffer)
+    while True:
+      position = self.buffer.rfind(DataFrame.magicPattern, 0, stop)
+      if position < 0: return None
+      stop = position + len(DataFrame.magicPattern) - 1 # next search ends before this magicBytes
+      if position + DataFrame.headerLength > len(self.buffer): continue
+      header = self.buffer.view(position, position+DataFrame.headerLength)
+      if DataFrame.checkHeader(header, 0, self.platform, self.buffer.capacity) is not None: continue
+      packetLen = DataFrame.packetLength(header)
+      if position + packetLen > len(self.buffer): continue
+      break
+    # count the skipped dataFrames by walking validated headers (magicBytes inside payloads, e.g. heatmaps, are not dataFrames),
+    # past `skipWalk` dataFrames the rest is estimated from their mean length, so the cost stays bounded however long the backlog is
+    skippedFrames = 0
+    walked = 0 # bytes covered by the counted dataFrames
+    index = self.buffer.find(DataFrame.magicPattern, 0, position)
+    while 0 <= index < position and skippedFrames < self.skipWalk:
+      header = self.buffer.view(index, index+DataFrame.headerLength)
+      if DataFrame.checkHeader(header, 0, self.platform, self.buffer.capacity) is None: 
+        skippedFrames += 1
+        walked += DataFrame.packetLength(header)
+        index += DataFrame.packetLength(header)
+      else: index += 1
+      index = self.buffer.find(DataFrame.magicPattern, index, position) if index < position else -1
+    if 0 <= index < position: skippedFrames += -(-(position - index) // (walked // skippedFrames))
+    self.skippedFrames += skippedFrames
+    self.skippedBytes += position
+    self.statistics.framesSkipped += skippedFrames
+    self.statistics.bytesDiscarded += position
+    if self.log_enable and position > 0: self.logger.log(event="FrameDecoder.latest", level="logging", message="skip {} bytes before the newest dataFrame".format(position))
+    self.buffer.consume(position)
+    packet = take(self.buffer.view(0, packetLen))
+    self.buffer.consume(packetLen)
+    self._synced = False
+    self._packetLen = None
+    return packet
+
+  def decode(self, limit: int | None = None) -> list[DataFrame]:
+    """Parse complete dataFrames from the buffer
+
+    Args:
+      limit (int | None, optional): Maximum number of dataFrames. Defaults to None, it will return all complete dataFrames.
+
+    Returns:
+      list[DataFrame]: parsed dataFrames in arrival order
+    """
+    if self.pool is None: dataFrames = [DataFrame.parse_packet(packet, self.log_file, self.log_echo, self.log_enable, self.TLV_types, layout=self.layout, statistics=self.statistics) for packet in self.packets(limit)]
+    else: dataFrames = [DataFrame.parse_packet(dataFrame.packet, self.log_file, self.log_echo, self.log_enable, self.TLV_types, dataFrame, self.layout, self.statistics) for dataFrame in self.frames(limit)]
+    for dataFrame in dataFrames: self.track(dataFrame)
+    return dataFrames
+
+  def track(self, dataFrame: DataFrame) -> None:
+    """Account the frameNumber of a parsed dataFrame in `frameNumbers`"""
+    if dataFrame.iscomplete: 
+      missed = self.frameNumbers.update(dataFrame.frameNumber)
+      if missed > 0 and self.log_enable: self.logger.log(event="FrameDecoder.track", level="Warn", message="{} dataFrames missed before frameNumber {}".format(missed, dataFrame.frameNumber))
+
+  def feed(self, data: bytes | bytearray | memoryview) -> list[DataFrame]:
+    """Append a chunk and parse the dataFrames it completes
+
+    Args:
+      data (bytes | bytearray | memoryview): Received bytes
+
+    Returns:
+      list[DataFrame]: completed dataFrames in arrival order
+    """
+    self.buffer.write(data)
+    return self.decode()
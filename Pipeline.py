@@ -0,0 +1,208 @@
+# %%
+import threading
+import concurrent.futures
+import collections
+import typing
+
+# %%
+class FrameQueue:
+  """Bounded queue joining two pipeline stages (e.g. the serial reader and the frame decoder)
+
+  The queue never holds more than `capacity` items, so memory stays capped while the consumer stalls.
+  What happens when it is full is the `policy`, which is the latency/completeness trade-off:
+    "block":       the producer waits for room (nothing is dropped here, the data backs up into the serial port)
+    "drop-oldest": the oldest queued item is dropped (lowest latency)
+    "drop-newest": the incoming item is dropped (keeps the earliest frames)
+  Dropped items are passed to `on_drop`, e.g. to release pooled frames.
+  """
+  policies: tuple[str, ...] = ("block", "drop-oldest", "drop-newest")
+
+  def __init__(self, capacity: int = 8, policy: str = "drop-oldest", on_drop: typing.Callable[[object], None] | None = None) -> None:
+    """Initialize FrameQueue
+
+    Args:
+      capacity (int, optional): Maximum number of queued items. Defaults to 8.
+      policy (str, optional): Overflow policy, one of `FrameQueue.policies`. Defaults to "drop-oldest".
+      on_drop (Callable[[object], None] | None, optional): Called with every dropped item. Defaults to None.
+    """
+    if capacity <= 0: raise ValueError("`capacity` must be positive: {capacity}".format(capacity=capacity))
+    if policy not in FrameQueue.policies: raise ValueError("Unrecognized policy: {policy}".format(policy=policy))
+    self.capacity: int = capacity
+    self.policy: str = policy
+    self.on_drop: typing.Callable[[object], None] | None = on_drop
+    self._items: collections.deque = collections.deque()
+    self._condition = threading.Condition()
+    self.dropped: int = 0 # items dropped by the policy
+    self.maxDepth: int = 0 # highest depth seen
+
+  def __len__(self) -> int:
+    return len(self._items)
+
+  @property
+  def depth(self) -> int:
+    """Number of queued items"""
+    return len(self._items)
+
+  def _drop(self, item) -> None:
+    self.dropped += 1
+    if self.on_drop is not None: self.on_drop(item)
+
+  def put(self, item, timeout: int | float | None = None) -> bool:
+    """Queue an item, applying the overflow policy when full
+
+    Args:
+      item (object): Item to queue
+      timeout (int | float | None, optional): Maximum wait in seconds with the "block" policy. Defaults to None, it will wait until there is room.
+
+    Returns:
+      bool: False only when the "block" wait timed out, the caller still owns `item`; otherwise `item` was queued or passed to `on_drop`
+    """
+    dropped = None
+    with self._condition:
+      if len(self._items) >= self.capacity:
+        if self.policy == "block":
+          if not self._condition.wait_for(lambda: len(self._items) < self.capacity, timeout): return False
+        elif self.policy == "drop-oldest":
+          dropped = self._items.popleft()
+        else:
+          dropped = item
+      if dropped is not item:
+        self._items.append(item)
+        if len(self._items) > self.maxDepth: self.maxDepth = len(self._items)
+        self._condition.notify_all()
+    if dropped is not None: self._drop(dropped)
+    return True
+
+  def get(self, timeout: int | float | None = None):
+    """Take the oldest item
+
+    Args:
+      timeout (int | float | None, optional): Maximum wait in seconds. Defaults to None, it will wait forever.
+
+    Returns:
+      object | None: oldest item, None on timeout
+    """
+    with self._condition:
+      if not self._condition.wait_for(lambda: len(self._items) > 0, timeout): return None
+      item = self._items.popleft()
+      self._condition.notify_all()
+      return item
+
+  def clear(self) -> None:
+    """Drop every queued item"""
+    with self._condition:
+      items = list(self._items)
+      self._items.clear()
+      self._condition.notify_all()
+    for item in items: self._drop(item)
+
+  def snapshot(self) -> dict[str, int | str]:
+    """Get the queue state as a dict"""
+    return {"queueDepth": len(self._items), "queueMaxDepth": self.maxDepth, "queueCapacity": self.capacity, "queueDropped": self.dropped, "queuePolicy": self.policy}
+
+# %%
+class Subscriber:
+  """Delivers published frames to one callback through its own bounded `FrameQueue`
+
+  Every subscriber is drained by its own worker (a thread, or tasks on `executor`), so a slow callback only delays and drops its own frames.
+  The same frame object is passed to every subscriber without copying; each queued frame holds one reference, released after the callback returns.
+  """
+  policies: tuple[str, ...] = ("drop-oldest", "drop-newest") # "block" would let one subscriber stall the publisher
+
+  def __init__(self, callback: typing.Callable[[object], None], TLV_types: set[int] | None = None, executor: concurrent.futures.Executor | None = None, capacity: int = 8, policy: str = "drop-oldest", release: typing.Callable[[object], None] | None = None, timeout: int | float = 0.1) -> None:
+    """Initialize Subscriber, call `start` to begin delivering
+
+    Args:
+      callback (Callable[[object], None]): Called with every delivered frame, which must not be used after it returns
+      TLV_types (set[int] | None, optional): Only frames carrying at least one of these TLVs are delivered. Defaults to None, it will deliver every frame.
+      executor (concurrent.futures.Executor | None, optional): Runs the callbacks. Defaults to None, it will use a dedicated thread.
+      capacity (int, optional): Maximum number of pending frames. Defaults to 8.
+      policy (str, optional): Overflow policy, one of `Subscriber.policies`. Defaults to "drop-oldest".
+      release (Callable[[object], None] | None, optional): Called with every frame once delivered or dropped. Defaults to None.
+      timeout (int | float, optional): Polling interval of the dedicated thread in seconds. Defaults to 0.1.
+    """
+    if policy not in Subscriber.policies: raise ValueError("Unrecognized policy: {policy}".format(policy=policy))
+    self.callback: typing.Callable[[object], None] = callback
+    self.TLV_types: set[int] | None = set(TLV_types) if TLV_types is not None else None
+    self.executor: concurrent.futures.Executor | None = executor
+    self.release: typing.Callable[[object], None] | None = release
+    self.timeout: int | float = timeout
+    self.queue: FrameQueue = FrameQueue(capacity, policy, on_drop=release)
+    self.active: bool = False
+    self.thread: threading.Thread | None = None
+    self._lock = threading.Lock()
+    self._scheduled: bool = False # a drain task is pending on `executor`
+    self.delivered: int = 0
+    self.errors: int = 0 # callbacks that raised
+    self.error: Exception | None = None # last exception raised by the callback
+
+  def accepts(self, frame) -> bool:
+    """Whether `frame` carries one of the subscribed TLVs"""
+    return self.TLV_types is None or any(TypeId in frame.TLVs for TypeId in self.TLV_types)
+
+  def offer(self, frame) -> None:
+    """Queue a frame whose reference is taken over by this subscriber"""
+    with self._lock: # `close` cannot clear the queue between the check and the put
+      active = self.active
+      if active: self.queue.put(frame)
+    if not active: 
+      if self.release is not None: self.release(frame)
+      return
+    if self.executor is not None: self._schedule()
+
+  def _deliver(self, frame) -> None:
+    try: self.callback(frame)
+    except Exception as exception:
+      self.errors += 1
+      self.error = exception
+    finally:
+      self.delivered += 1
+      if self.release is not None: self.release(frame)
+
+  def _run(self) -> None:
+    while self.active: 
+      frame = self.queue.get(self.timeout)
+      if frame is not None: self._deliver(frame)
+
+  def _schedule(self) -> None:
+    with self._lock:
+      if self._scheduled or not self.active: return
+      self._scheduled = True
+    self.executor.submit(self._drain)
+
+  def _drain(self) -> None:
+    while True:
+      frame = self.queue.get(0) if self.active else None
+      if frame is not None: 
+        self._deliver(frame)
+        continue
+      with self._lock: # checked under the lock, so a frame offered meanwhile either is seen here or schedules a new task
+        if len(self.queue) == 0 or not self.active: 
+          self._scheduled = False
+          return
+
+  def start(self) -> "Subscriber":
+    """Begin delivering
+
+    Returns:
+      Subscriber: self
+    """
+    self.active = True
+    if self.executor is None and (self.thread is None or not self.thread.is_alive()): 
+      self.thread = threading.Thread(target=self._run, daemon=True)
+      self.thread.start()
+    return self
+
+  def close(self) -> None:
+    """Stop delivering and drop the pending frames"""
+    with self._lock: self.active = False
+    if self.thread is not None and self.thread.is_alive() and self.thread is not threading.current_thread(): 
+      self.thread.join(self.timeout * 2)
+    self.queue.clear()
+
+  def snapshot(self) -> dict[str, int | str]:
+    """Get the subscriber state as a dict"""
+    snapshot = self.queue.snapshot()
+    snapshot["delivered"] = self.delivered
+    snapshot["errors"] = self.errors
+    return snapshot
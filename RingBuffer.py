@@ -0,0 +1,153 @@
+# %%
+import serial # pyserial-3.5
+
+# %%
+class RingBuffer:
+  """Preallocated receive buffer with read/write cursors.
+
+  Bytes are written in place (`readinto`/`write`) behind the write cursor and consumed from the read cursor.
+  Unread bytes are always contiguous, so `view()` can hand a `memoryview` window to the parser without copying.
+  When the tail runs out of space, the unread bytes are moved back to the front of the storage, which happens at most once per `capacity` bytes received.
+  """
+  def __init__(self, capacity: int = 131072) -> None:
+    """Initialize RingBuffer
+
+    Args:
+      capacity (int, optional): Size of the preallocated storage in bytes. Defaults to 131072.
+    """
+    if capacity <= 0: raise ValueError("`capacity` must be positive: {capacity}".format(capacity=capacity))
+    self.capacity: int = capacity
+    self._storage: bytearray = bytearray(capacity)
+    self._memory: memoryview = memoryview(self._storage)
+    self._read: int = 0
+    self._write: int = 0
+    self.discarded: int = 0 # bytes dropped because the buffer was full
+
+  def __len__(self) -> int:
+    return self._write - self._read
+
+  def __bytes__(self) -> bytes:
+    return bytes(self._memory[self._read:self._write])
+
+  @property
+  def free(self) -> int:
+    """Number of bytes that can be written without dropping unread data"""
+    return self.capacity - (self._write - self._read)
+
+  def clear(self) -> None:
+    """Drop all unread bytes"""
+    self._read = 0
+    self._write = 0
+
+  def _compact(self) -> None:
+    """Move the unread bytes to the front of the storage"""
+    length = self._write - self._read
+    if self._read == 0: return
+    if length <= self._read: # source and destination do not overlap
+      self._storage[0:length] = self._memory[self._read:self._write]
+    else:
+      self._storage[0:length] = self._storage[self._read:self._write]
+    self._read = 0
+    self._write = length
+
+  def _reserve(self, size: int) -> memoryview:
+    """Get a writable window of up to `size` bytes behind the write cursor
+
+    If the unread bytes and `size` together exceed the capacity, the oldest unread bytes are dropped.
+    """
+    size = min(size, self.capacity)
+    if self.capacity - self._write < size:
+      if self.free < size:
+        drop = size - self.free
+        self._read += drop
+        self.discarded += drop
+      self._compact()
+    return self._memory[self._write:self._write+size]
+
+  def write(self, data: bytes | bytearray | memoryview) -> int:
+    """Copy `data` into the buffer
+
+    Args:
+      data (bytes | bytearray | memoryview): Bytes to append
+
+    Returns:
+      int: number of bytes written
+    """
+    data = memoryview(data)
+    if len(data) > self.capacity: data = data[len(data)-self.capacity:]
+    window = self._reserve(len(data))
+    window[:] = data
+    self._write += len(data)
+    return len(data)
+
+  def readinto(self, port: serial.Serial, size: int | None = None) -> int:
+    """Read from `port` directly into the buffer
+
+    Args:
+      port (serial.Serial): Port (or any object providing `readinto`) to read from
+      size (int | None, optional): Bytes to read. Defaults to None, it will use `port.in_waiting`.
+
+    Returns:
+      int: number of bytes read
+    """
+    if size is None: size = port.in_waiting
+    if size <= 0: return 0
+    window = self._reserve(size)
+    count = port.readinto(window)
+    count = count if count is not None else 0
+    self._write += count
+    return count
+
+  def view(self, start: int = 0, stop: int | None = None) -> memoryview:
+    """Get a window over the unread bytes without copying
+
+    Args:
+      start (int, optional): Offset from the read cursor. Defaults to 0.
+      stop (int | None, optional): End offset from the read cursor. Defaults to None, it will use all unread bytes.
+
+    Returns:
+      memoryview: window of unread bytes, valid until the next write
+    """
+    stop = len(self) if stop is None else min(stop, len(self))
+    return self._memory[self._read+start:self._read+stop]
+
+  def find(self, sub: bytes, start: int = 0, stop: int | None = None) -> int:
+    """Find `sub` in the unread bytes without copying
+
+    Args:
+      sub (bytes): Pattern to search
+      start (int, optional): Offset from the read cursor to start searching. Defaults to 0.
+      stop (int | None, optional): End offset from the read cursor. Defaults to None, it will search all unread bytes.
+
+    Returns:
+      int: offset from the read cursor, or -1 if not found
+    """
+    stop = len(self) if stop is None else min(stop, len(self))
+    position = self._storage.find(sub, self._read+start, self._read+stop)
+    return position - self._read if position >= 0 else -1
+
+  def rfind(self, sub: bytes, start: int = 0, stop: int | None = None) -> int:
+    """Find the last `sub` in the unread bytes without copying
+
+    Args:
+      sub (bytes): Pattern to search
+      start (int, optional): Offset from the read cursor to start searching. Defaults to 0.
+      stop (int | None, optional): End offset from the read cursor. Defaults to None, it will search all unread bytes.
+
+    Returns:
+      int: offset from the read cursor, or -1 if not found
+    """
+    stop = len(self) if stop is None else min(stop, len(self))
+    position = self._storage.rfind(sub, self._read+start, self._read+stop)
+    return position - self._read if position >= 0 else -1
+
+  def consume(self, size: int) -> None:
+    """Advance the read cursor
+
+    Args:
+      size (int): Bytes to release
+    """
+    self._read += min(size, len(self))
+    if self._read == self._write:
+      self._read = 0
+      self._write = 0
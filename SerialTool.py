@@ -39,4 +39,70 @@ def serial_info(port: serial.Serial, Name: str | None=None):
     if port_info.product           is not None:  result += prefix + "product           : " + port_info.product           + '\n'
     if port_info.interface         is not None:  result += prefix + "interface         : " + port_info.interface         + '\n'
     break
-  return result
\ No newline at end of file
+  return result
+# %%
+class CLIError(Exception):
+  """The device CLI rejected a command"""
+  def __init__(self, commandLine: str, reply: list[str]):
+    self.commandLine: str = commandLine
+    self.reply: list[str] = reply
+    super().__init__("`{commandLine}`: {reply}".format(commandLine=commandLine, reply=" / ".join(reply)))
+
+class CLIParser:
+  """Incremental parser of the CLI output read from the control port
+
+  The mmwDemo CLI echoes each command line, prints its response (`Done`, `Error ...`, usage text, ...) and ends with the prompt, so a reply is everything up to the next prompt.
+  """
+  errors: tuple[str, ...] = ("Error", "Invalid usage", "is not recognized as a CLI command")
+
+  def __init__(self, prompt: bytes = b"mmwDemo:/>") -> None:
+    """Initialize CLIParser
+
+    Args:
+      prompt (bytes, optional): CLI prompt ending every reply. Defaults to b"mmwDemo:/>".
+    """
+    self.prompt: bytes = prompt
+    self._buffer: bytearray = bytearray()
+
+  def clear(self) -> None:
+    """Drop the bytes of an unfinished reply"""
+    self._buffer.clear()
+
+  def feed(self, data: bytes | bytearray | memoryview) -> list[list[str]]:
+    """Append bytes read from the control port
+
+    Args:
+      data (bytes | bytearray | memoryview): Bytes read
+
+    Returns:
+      list[list[str]]: non-empty lines of every reply completed by `data`
+    """
+    self._buffer += data
+    replies: list[list[str]] = []
+    index = self._buffer.find(self.prompt)
+    while index >= 0:
+      text = self._buffer[:index].decode(errors="replace")
+      del self._buffer[:index+len(self.prompt)]
+      replies.append([line.strip() for line in text.splitlines() if line.strip() != ""])
+      index = self._buffer.find(self.prompt)
+    return replies
+
+  @staticmethod
+  def check(commandLine: str, reply: list[str]) -> list[str]:
+    """Strip the echoed command line and raise if the reply reports an error
+
+    Args:
+      commandLine (str): Command line sent
+      reply (list[str]): Lines from `feed`
+
+    Raises:
+      CLIError: a line reports an error
+
+    Returns:
+      list[str]: response lines
+    """
+    commandLine = commandLine.strip()
+    if len(reply) > 0 and reply[0].endswith(commandLine): reply = reply[1:]
+    for line in reply:
+      if any(error in line for error in CLIParser.errors): raise CLIError(commandLine, reply)
+    return reply
@@ -1,6 +1,10 @@
 # %%
 import time
 import threading
+import collections
+import typing
+import concurrent.futures
+import asyncio
 # import os
 
 import serial # pyserial-3.5
@@ -10,13 +14,17 @@ try:
   import Configuration
   import DataFrame
   import Logging
+  import Pipeline
+  import RingBuffer
   import SerialTool
 except ModuleNotFoundError:
   from . import Configuration
   from . import DataFrame
   from . import Logging
+  from . import Pipeline
+  from . import RingBuffer
   from . import SerialTool
-  __all__ = ["Configuration", "DataFrame"]
+  __all__ = ["Configuration", "DataFrame", "Pipeline", "RingBuffer", "SerialTool"]
   version = 1.0
 
 if __name__ == '__main__':
@@ -26,7 +34,7 @@ if __name__ == '__main__':
 # %% 
 class Ti_MmWave:
 
-  def __init__(self, platform: str, Ctrl_port_name: str, Data_port_name: str, Ctrl_port_baudrate: int = 115200, Data_port_baudrate: int = 921600, Send_timeInterval: int | float | None = 0.025, Buffering_timeInterval: int | float | None = 0.05, Parse_timeInterval: int | float | None = 0.2, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False):
+  def __init__(self, platform: str, Ctrl_port_name: str, Data_port_name: str, Ctrl_port_baudrate: int = 115200, Data_port_baudrate: int = 921600, Send_timeInterval: int | float | None = 0.025, Buffering_timeInterval: int | float | None = 0.05, Parse_timeInterval: int | float | None = 0.2, log_file: str | None = None, log_echo: bool = False, log_enable: bool = False, *, Ctrl_timeout: int | float | None = None, Buffer_capacity: int = 131072, Frames_capacity: int = 64, Frame_pool_size: int | None = None, Latest_only: bool = False, TLV_types: set[int] | None = None, Reader_mode: str = "polling", Reader_timeout: int | float = 0.1, Queue_capacity: int = 8, Queue_policy: str = "drop-oldest"):
 
     self.platform = platform
 
@@ -42,12 +50,19 @@ class Ti_MmWave:
     if self.log_enable: self.logger.log(event="{}.initializing".format(self.__str__()), level="infomation", message=SerialTool.serial_info(port=self.Ctrl_port, Name="Ctrl port"))
     if self.log_enable: self.logger.log(event="{}.initializing".format(self.__str__()), level="infomation", message=SerialTool.serial_info(port=self.Data_port, Name="Data port"))
 
-    self.buffer = bytearray()
+    self.decoder = DataFrame.FrameDecoder(Buffer_capacity, TLV_types=TLV_types, platform=platform)
+    self.buffer: RingBuffer.RingBuffer = self.decoder.buffer
+    self.buffer_lock = threading.Lock() # guards `self.buffer` and `self.decoder` between Buffering and Parse
+    self.Latest_only = Latest_only # parse only the newest complete frame and drop the stale backlog (see `self.decoder.skippedFrames`)
 
     self.config = Configuration.Configuration_2_1_0(platform=platform)
-    self.data = DataFrame.DataFrame()
+    self.data = DataFrame.DataFrame.emptyFrame
 
     self.Send_timeInterval = Send_timeInterval
+    # with `Ctrl_timeout`, every command waits for its CLI reply (see `Ctrl_Request_unit`) instead of sleeping `Send_timeInterval`/`wait`
+    self.Ctrl_timeout = Ctrl_timeout
+    self._CtrlPort_lock_ = threading.Lock() # one request at a time on the control port, see `Ctrl_Request_unit`
+    self.applied_commandLines: list[str] | None = None # `self.config` as last sent in full (from flushCfg), see `reconfigure`
 
     # Thread Object
     self.Buffering_timeInterval = Buffering_timeInterval
@@ -56,10 +71,32 @@ class Ti_MmWave:
     self.Parse_timeInterval = Parse_timeInterval
     self.Parse_active = False
     self.Parse_thread = threading.Thread(target=self.Data_Parse_continuous, args=(self.Parse_timeInterval,))
-    self.crc32: numpy.uint32 | None = None
+    # "polling": Buffering and Parse threads sleep between passes; "blocking": one Reader thread blocks on the data port and parses as soon as bytes arrive
+    # "pipeline": the Reader thread splits frames off the data port into `self.queue` and a Decode thread parses them
+    # "asyncio": no data thread is started, frames are read by `aframes` inside the event loop
+    if Reader_mode != "polling" and Reader_mode != "blocking" and Reader_mode != "pipeline" and Reader_mode != "asyncio": raise ValueError("Unrecognized Reader_mode: {Reader_mode}".format(Reader_mode=Reader_mode))
+    self.Reader_mode = Reader_mode
+    self.Reader_timeout = Reader_timeout
+    self.Reader_active = False
+    self.Reader_thread = threading.Thread(target=self.Data_Reader_continuous)
+    # bounded queue of split (not yet parsed) frames between the Reader and Decode threads in "pipeline" mode, dropped frames are released to the frame pool
+    self.queue = Pipeline.FrameQueue(Queue_capacity, Queue_policy, on_drop=DataFrame.DataFrame.release)
+    self.Decode_active = False
+    self.Decode_thread = threading.Thread(target=self.Data_Decode_continuous)
+    self.pointUnits: DataFrame.DataFrame.PointUnits | None = None # rebuilt by `get_pointUnits` when the profile changes
+    self.crc32: int | None = None # fingerprint of the frame last returned by `get_detectedPoints`
+    # latest frame slot: `self.data` is replaced under `self.frame_condition` and `self.frame_seq` counts published frames
+    self.frame_condition = threading.Condition()
+    self.frame_seq: int = 0
+    self.consumed_seq: int = 0 # last `frame_seq` returned by `get_detectedPoints`
+    self.frames: collections.deque[DataFrame.DataFrame] = collections.deque(maxlen=Frames_capacity) # published frames not yet taken by `get_frames`
+    self.frames_active: bool = False # `self.frames` only collects once `get_frames` was called, so unused backlogs do not pin pooled frames
+    self.subscribers: tuple[Pipeline.Subscriber, ...] = () # replaced (never mutated) under `self.frame_condition`, see `subscribe`
+    # recycled frames, sized from `self.config.parameter` at sensorStart; `self.data` and `self.frames` (once `get_frames` was called) hold one reference each, so the pool should then be larger than `Frames_capacity`
+    self.Frame_pool_size = Frame_pool_size
 
     self.State = "initialized"
-    self._DataPort_inUse_ = False
+    self._DataPort_lock_ = threading.Lock()
 
     if self.log_enable: self.logger.log(event="{}.initializing".format(self.__str__()), level="infomation", message="Initialization completed")
     self.sensorStop()
@@ -84,26 +121,22 @@ class Ti_MmWave:
 
     Args:
       commandLine (str): Configuration commandLine
-      wait (float | int, optional): Configured wait delay. Defaults to 0.05.
+      wait (float | int, optional): Configured wait delay, unused with `Ctrl_timeout`. Defaults to 0.05.
       log (bool, optional): log configuration instructions. Defaults to False.
+
+    Raises:
+      SerialTool.CLIError: the device rejected the command (only with `Ctrl_timeout`)
     """
     commandLine = commandLine.strip()
-    self.Ctrl_port.write(commandLine.__add__('\n').encode())
+    if self.Ctrl_timeout is not None: self.Ctrl_Request_unit(commandLine)
+    else: self.Ctrl_port.write(commandLine.__add__('\n').encode())
 
     self.config.parse_commandLine(commandLine=commandLine)
     if self.log_enable: self.logger.log(event="{}.configure_unit".format(self.__str__()), level="logging", message="commandLine: `{commandLine}`".format(commandLine=commandLine))
 
-    command: str = commandLine.split(' ')[0]
-    if command == "sensorStart":
-      old_State: str = self.State
-      self.State = "Sensor_Start"
-      if old_State != self.State and self.log_enable: self.logger.log(event="{}.stateChanged".format(self.__str__()), level="logging", message="Sensor Start")
-    if command == "sensorStop":
-      old_State: str = self.State
-      self.State = "Sensor_Stop"
-      if old_State != self.State and self.log_enable: self.logger.log(event="{}.stateChanged".format(self.__str__()), level="logging", message="Sensor Stop")
-    
-    time.sleep(wait)
+    if self.Ctrl_timeout is None: 
+      self.Ctrl_State_unit(commandLine)
+      time.sleep(wait)
 
   def configure(self, commandLines: list[str] | str | None = None, wait: float | int = 0.05, log: bool = False):
     """configuration
@@ -116,12 +149,14 @@ class Ti_MmWave:
     if commandLines == None:
       for commandLine in self.config.command.commandLines():
         self.configure_unit(commandLine=commandLine, wait=wait, log=log)
+      self.Ctrl_Applied_unit(self.config.command.commandLines())
     else: 
       for commandLine in commandLines: # Assume `commandLines` is list[str]
         if len(commandLine) == 1: # `commandLines` is str, not list[str]
           self.configure_unit(commandLine=commandLines, wait=wait, log=log)
           break
         self.configure_unit(commandLine=commandLine, wait=wait, log=log)
+      self.Ctrl_Applied_unit(commandLines)
   def configure_file(self, CFG_file_name: str = "profile.cfg", wait: float | int = 0.05, log: bool = False):
     """configuration from file
 
@@ -143,6 +178,8 @@ class Ti_MmWave:
     """
     # self.configure_unit(commandLine="sensorStop", wait=wait, log=log)
     if self.State != "Sensor_Stop": 
+      self.Data_Reader_thread_stop()
+      self.Data_Decode_thread_stop()
       self.Data_Buffering_thread_stop()
       self.Data_Parse_thread_stop()
       self.Ctrl_Send_unit(commandLine="sensorStop")
@@ -155,9 +192,21 @@ class Ti_MmWave:
     """
     # self.configure_unit(commandLine="sensorStart", wait=wait, log=log)
     if self.State != "Sensor_Start": 
+      # drop the bytes of the previous run, a stale partial frame would swallow the first new frame
+      with self._DataPort_lock_, self.buffer_lock: 
+        self.Data_port.reset_input_buffer()
+        self.decoder.reset()
       self.Ctrl_Send_unit(commandLine="sensorStart")
-      self.Data_Buffering_thread_start()
-      self.Data_Parse_thread_start()
+      if self.Reader_mode == "blocking": 
+        self.Data_Reader_thread_start()
+      elif self.Reader_mode == "pipeline": 
+        self.Data_Decode_thread_start()
+        self.Data_Reader_thread_start()
+      elif self.Reader_mode == "asyncio": 
+        pass
+      else:
+        self.Data_Buffering_thread_start()
+        self.Data_Parse_thread_start()
 
   def record_DataPort(self, record_file_name: str="Record/Data.bin") -> None:
     """Record sensing data to file
@@ -165,9 +214,7 @@ class Ti_MmWave:
     Args:
         record_file_name (str, optional): File name. Defaults to "Record/Data.bin".
     """
-    while self._DataPort_inUse_: pass # wait for dataport reading
-    else: 
-      self._DataPort_inUse_ = True
+    with self._DataPort_lock_: # wait for dataport reading
       try:
         with open(file=record_file_name, mode='wb+') as record_file:
           while self.Data_port.in_waiting > 0:
@@ -175,7 +222,6 @@ class Ti_MmWave:
             record_file.write(Data_buffer)
       except KeyboardInterrupt:
         pass
-      self._DataPort_inUse_ = False
 
   def Ctrl_Load_unit(self, commandLine: str):
     commandLine = commandLine.strip()
@@ -195,11 +241,13 @@ class Ti_MmWave:
       CFG_lines: list[str] = [CFG_line.strip() for CFG_line in CFG_file.readlines()]
       self.Ctrl_Load(CFG_lines)
 
-  def Ctrl_Send_unit(self, commandLine: str, timeInterval: float | int | None = None):
-    self.Ctrl_port.write(commandLine.strip().__add__('\n').encode())
-    if self.log_enable: self.logger.log(event="{}.Ctrl_Send_unit".format(self.__str__()), level="logging", message="commandLine: `{commandLine}`".format(commandLine=commandLine))
-    command: str = commandLine.split(' ')[0]
+  def Ctrl_State_unit(self, commandLine: str) -> None:
+    """Track the sensor state after `commandLine` was sent"""
+    command: str = commandLine.strip().split(' ')[0]
     if command == "sensorStart":
+      self.decoder.frameNumbers.restart() # the device restarts frameNumber from 1, the counters keep covering the whole session like `self.decoder.statistics`
+      if self.Frame_pool_size is not None: self.update_framePool()
+      self.update_frameLayout()
       old_State: str = self.State
       self.State = "Sensor_Start"
       if old_State != self.State and self.log_enable: self.logger.log(event="{}.stateChanged".format(self.__str__()), level="logging", message="Sensor Start")
@@ -207,6 +255,76 @@ class Ti_MmWave:
       old_State: str = self.State
       self.State = "Sensor_Stop"
       if old_State != self.State and self.log_enable: self.logger.log(event="{}.stateChanged".format(self.__str__()), level="logging", message="Sensor Stop")
+  def Ctrl_Request_unit(self, commandLine: str, timeout: int | float | None = None) -> list[str]:
+    """Send a command and wait until the CLI replies (`Done`, `Error ...`) and shows its prompt
+
+    Args:
+      commandLine (str): Command line, empty lines and `%` comments are not sent
+      timeout (int | float | None, optional): Maximum wait in seconds. Defaults to None, it will use `Ctrl_timeout` (or 1 second).
+
+    Raises:
+      SerialTool.CLIError: the device rejected the command
+      TimeoutError: no complete reply within `timeout`
+
+    Returns:
+      list[str]: response lines, without the echoed command
+    """
+    commandLine = commandLine.strip()
+    if commandLine == "" or commandLine[0] == '%': return []
+    if timeout is None: timeout = self.Ctrl_timeout if self.Ctrl_timeout is not None else 1.0
+    parser = SerialTool.CLIParser()
+    with self._CtrlPort_lock_:
+      port_timeout = self.Ctrl_port.timeout
+      try:
+        self.Ctrl_port.reset_input_buffer() # drop unsolicited output, e.g. the boot banner
+        self.Ctrl_port.write(commandLine.__add__('\n').encode())
+        self.Ctrl_port.timeout = timeout # set once, every timeout change reconfigures the port
+        deadline = time.monotonic() + timeout
+        replies: list[list[str]] = []
+        while len(replies) == 0:
+          if time.monotonic() >= deadline: raise TimeoutError("No reply to `{commandLine}` within {timeout} s".format(commandLine=commandLine, timeout=timeout))
+          replies = parser.feed(self.Ctrl_port.read(max(1, self.Ctrl_port.in_waiting)))
+      finally:
+        self.Ctrl_port.timeout = port_timeout
+    return self.Ctrl_Reply_unit(commandLine, replies[0])
+  async def Ctrl_Request_unit_async(self, commandLine: str, timeout: int | float | None = None) -> list[str]:
+    """Like `Ctrl_Request_unit`, awaited from the running event loop (it runs in the loop's default executor, so it is serialized with the sync requests)"""
+    return await asyncio.get_running_loop().run_in_executor(None, self.Ctrl_Request_unit, commandLine, timeout)
+  def Ctrl_Reply_unit(self, commandLine: str, reply: list[str]) -> list[str]:
+    try:
+      reply = SerialTool.CLIParser.check(commandLine, reply)
+    except SerialTool.CLIError as exception:
+      if self.log_enable: self.logger.log(event="{}.Ctrl_Request_unit".format(self.__str__()), level="logging", message="Error: `{exception}`".format(exception=exception))
+      raise
+    if self.log_enable: self.logger.log(event="{}.Ctrl_Request_unit".format(self.__str__()), level="logging", message="commandLine: `{commandLine}`, reply: `{reply}`".format(commandLine=commandLine, reply=" / ".join(reply)))
+    self.Ctrl_State_unit(commandLine)
+    return reply
+  def Ctrl_Request(self, commandLines: list[str] | str | None = None, timeout: int | float | None = None) -> list[list[str]]:
+    """Send commands one after another with `Ctrl_Request_unit`, stopping at the first error
+
+    Args:
+      commandLines (list[str] | str | None, optional): Command lines. Defaults to None, it will use self.config data.
+      timeout (int | float | None, optional): Maximum wait per command in seconds. Defaults to None, it will use `Ctrl_timeout` (or 1 second).
+
+    Returns:
+      list[list[str]]: response lines of every command
+    """
+    if commandLines is None: commandLines = self.config.command.commandLines()
+    if isinstance(commandLines, str): commandLines = [commandLines]
+    replies = [self.Ctrl_Request_unit(commandLine, timeout) for commandLine in commandLines]
+    self.Ctrl_Applied_unit(commandLines)
+    return replies
+  async def Ctrl_Request_async(self, commandLines: list[str] | str | None = None, timeout: int | float | None = None) -> list[list[str]]:
+    """Like `Ctrl_Request`, awaited from the running event loop (see `Ctrl_Request_unit_async`)"""
+    return await asyncio.get_running_loop().run_in_executor(None, self.Ctrl_Request, commandLines, timeout)
+
+  def Ctrl_Send_unit(self, commandLine: str, timeInterval: float | int | None = None):
+    if self.Ctrl_timeout is not None: 
+      self.Ctrl_Request_unit(commandLine)
+      return
+    self.Ctrl_port.write(commandLine.strip().__add__('\n').encode())
+    if self.log_enable: self.logger.log(event="{}.Ctrl_Send_unit".format(self.__str__()), level="logging", message="commandLine: `{commandLine}`".format(commandLine=commandLine))
+    self.Ctrl_State_unit(commandLine)
     try:
       time.sleep(timeInterval if timeInterval is not None else self.Send_timeInterval if self.Send_timeInterval is not None else 0.025)
     except Exception as exception:
@@ -218,13 +336,38 @@ class Ti_MmWave:
         self.Ctrl_Send_unit(commandLines, timeInterval)
         break
       else: self.Ctrl_Send_unit(commandLine, timeInterval)
+    self.Ctrl_Applied_unit(commandLines)
+  def Ctrl_Applied_unit(self, commandLines: list[str] | str) -> None:
+    """Remember `self.config` as applied when `commandLines` was a full configuration (contains flushCfg)"""
+    if isinstance(commandLines, str): commandLines = [commandLines]
+    if any(commandLine.strip().startswith("flushCfg") for commandLine in commandLines): 
+      self.applied_commandLines = self.config.command.commandLines()
+  def reconfigure(self, full: bool = False, timeInterval: float | int | None = None) -> str:
+    """Apply the changes made to `self.config` (e.g. by `set_cfarRangeThreshold_dB`), sending only the changed commands when the SDK allows it
+
+    See `Configuration.Configuration_2_1_0.Command.reconfiguration` for the modes; "restart" and "full" stop the sensor and start it again if it was running.
+
+    Args:
+      full (bool, optional): Always send the full configuration (from flushCfg). Defaults to False.
+      timeInterval (float | int | None, optional): Passed to `Ctrl_Send_unit`. Defaults to None.
+
+    Returns:
+      str: mode used, "none", "runtime", "restart" or "full"
+    """
+    commandLines = self.config.command.commandLines()
+    mode, changed = Configuration.Configuration_2_1_0.Command.reconfiguration(None if full else self.applied_commandLines, commandLines)
+    if self.log_enable: self.logger.log(event="{}.reconfigure".format(self.__str__()), level="logging", message="mode: `{mode}`, changed: `{changed}`".format(mode=mode, changed=changed))
+    if mode == "none": return mode
+    running = self.State == "Sensor_Start"
+    if mode != "runtime" and running: self.sensorStop()
+    for commandLine in changed: self.Ctrl_Send_unit(commandLine, timeInterval)
+    self.applied_commandLines = commandLines
+    if mode != "runtime" and running: self.sensorStart()
+    return mode
 
   def Data_Buffering_unit(self) -> None:
-    while self._DataPort_inUse_: pass # wait for dataport reading
-    else: 
-      self._DataPort_inUse_ = True
-      self.buffer = self.buffer + bytearray(self.Data_port.read(self.Data_port.in_waiting))
-      self._DataPort_inUse_ = False
+    with self._DataPort_lock_, self.buffer_lock: # wait for dataport reading
+      self.buffer.readinto(self.Data_port, self.Data_port.in_waiting)
   def Data_Buffering_continuous(self, timeInterval: int | float | None = None) -> None:
     try:
       while self.Buffering_active: 
@@ -236,6 +379,8 @@ class Ti_MmWave:
       pass
   def Data_Buffering_thread_start(self):
     self.Buffering_active = True
+    if self.Buffering_thread.is_alive(): return
+    self.Buffering_thread = threading.Thread(target=self.Data_Buffering_continuous, args=(self.Buffering_timeInterval,))
     self.Buffering_thread.start()
   def Data_Buffering_thread_stop(self):
     self.Buffering_active = False
@@ -243,13 +388,19 @@ class Ti_MmWave:
   def Data_Record_Buffer(self, record_file_name: str="Record/Data.bin", duration: int | float = 0) -> None:
     with open(file=record_file_name, mode='wb+') as record_file:
       if duration <= 0:
-        record_file.write(self.buffer)
+        with self.buffer_lock:
+          record_file.write(self.buffer.view())
       else: 
         startTime = time.time()
-        self.buffer.clear()
-        # stop Buffering and Parse if needed
+        with self.buffer_lock:
+          self.decoder.reset()
+        # stop Reader, Buffering and Parse if needed
+        Reader_interrupt = False
         Buffering_interrupt = False
         Parse_interrupt = False
+        if self.Reader_active: 
+          Reader_interrupt = True
+          self.Data_Reader_thread_stop()
         if self.Buffering_active: 
           Buffering_interrupt = True
           self.Data_Buffering_thread_stop()
@@ -259,17 +410,56 @@ class Ti_MmWave:
         # record
         while time.time() - startTime < duration:
           self.Data_Buffering_unit()
-          record_file.write(self.buffer)
-        # start Buffering and Parse if needed
+          with self.buffer_lock:
+            record_file.write(self.buffer.view())
+            self.decoder.reset()
+        # start Reader, Buffering and Parse if needed
+        if Reader_interrupt: self.Data_Reader_thread_start()
         if Buffering_interrupt: self.Data_Buffering_thread_start()
         if Parse_interrupt: self.Data_Parse_thread_start()
 
-  def Data_Parse_unit(self, log: str | None = None) -> None:
-    data, index = DataFrame.DataFrame.parse(self.buffer, log)
-    if data is not None: 
-      self.data = data
-      self.buffer = self.buffer[index:]
+  def Data_Parse_unit(self, log: str | None = None) -> int:
+    """Parse and publish every complete frame in the buffer (only the newest one if `Latest_only`)
+
+    Args:
+      log (str | None, optional): Passed to `DataFrame.parse_packet`. Defaults to None.
+
+    Returns:
+      int: number of published frames
+    """
+    dataFrames = self.Data_Split_unit()
+    for dataFrame in dataFrames: 
+      self.Data_Decode_unit(dataFrame, log)
       # print(f"[{datetime.datetime.now()}] Data_Parse_unit")
+    return len(dataFrames)
+  def Data_Split_unit(self) -> list[DataFrame.DataFrame]:
+    """Split every complete frame off the buffer (only the newest one if `Latest_only`), without parsing
+
+    Returns:
+      list[DataFrame.DataFrame]: frames whose `packet` is set, in arrival order
+    """
+    with self.buffer_lock:
+      if self.Latest_only: 
+        dataFrame = self.decoder.latest_frame()
+        return [dataFrame] if dataFrame is not None else []
+      return self.decoder.frames()
+  def Data_Decode_unit(self, dataFrame: DataFrame.DataFrame, log: str | None = None) -> bool:
+    """Parse a split frame and publish it, malformed frames (counted in `integrityFailures`) are released instead
+
+    Args:
+      dataFrame (DataFrame.DataFrame): Frame from `Data_Split_unit`
+      log (str | None, optional): Passed to `DataFrame.parse_packet`. Defaults to None.
+
+    Returns:
+      bool: whether the frame was published
+    """
+    DataFrame.DataFrame.parse_packet(dataFrame.packet, log, TLV_types=self.decoder.TLV_types, dataFrame=dataFrame, layout=self.decoder.layout, statistics=self.decoder.statistics)
+    if not dataFrame.iscomplete: 
+      dataFrame.release()
+      return False
+    self.decoder.track(dataFrame)
+    self.publish_frame(dataFrame)
+    return True
   def Data_Parse_continuous(self, timeInterval: int | float | None = None, log: str | None = None) -> None:
     try:
       while self.Parse_active: 
@@ -281,20 +471,311 @@ class Ti_MmWave:
       pass
   def Data_Parse_thread_start(self):
     self.Parse_active = True
+    if self.Parse_thread.is_alive(): return
+    self.Parse_thread = threading.Thread(target=self.Data_Parse_continuous, args=(self.Parse_timeInterval,))
     self.Parse_thread.start()
   def Data_Parse_thread_stop(self):
     self.Parse_active = False
 
+  def Data_Reader_unit(self, log: str | None = None) -> int:
+    """Block on the data port until bytes arrive (or `Reader_timeout` expires), then parse every complete frame (queue them in "pipeline" mode)
+
+    Args:
+      log (str | None, optional): Passed to `Data_Parse_unit`. Defaults to None.
+
+    Returns:
+      int: number of bytes read
+    """
+    with self._DataPort_lock_: # wait for dataport reading
+      first: bytes = self.Data_port.read(1) if self.Data_port.in_waiting == 0 else b"" # blocks for the first byte without holding `buffer_lock`
+      with self.buffer_lock:
+        count = self.buffer.write(first) if len(first) > 0 else 0
+        count += self.buffer.readinto(self.Data_port, self.Data_port.in_waiting)
+    if count > 0: 
+      if self.Reader_mode == "pipeline":
+        for dataFrame in self.Data_Split_unit(): 
+          # the "block" policy waits here, the data backs up into the data port
+          while not self.queue.put(dataFrame, self.Reader_timeout): 
+            if not self.Reader_active: 
+              dataFrame.release()
+              break
+      else: self.Data_Parse_unit(log)
+    return count
+  def Data_Reader_continuous(self, log: str | None = None) -> None:
+    try:
+      while self.Reader_active: 
+        self.Data_Reader_unit(log)
+    except KeyboardInterrupt:
+      pass
+  def Data_Reader_thread_start(self):
+    self.Data_port.timeout = self.Reader_timeout
+    self.Reader_active = True
+    if self.Reader_thread.is_alive(): return
+    self.Reader_thread = threading.Thread(target=self.Data_Reader_continuous)
+    self.Reader_thread.start()
+  def Data_Reader_thread_stop(self):
+    self.Reader_active = False
+    if self.Reader_thread.is_alive() and self.Reader_thread is not threading.current_thread(): 
+      self.Reader_thread.join(self.Reader_timeout * 2)
+
+  async def aframes(self, timeout: int | float | None = None, log: str | None = None) -> typing.AsyncIterator[DataFrame.DataFrame]:
+    """Stream parsed frames inside the running event loop, e.g. `async for dataFrame in device.aframes(timeout=1):`
+
+    The data port is watched with `loop.add_reader`: bytes are read only when the port is readable, and complete frames are parsed and published (see `publish_frame`) in the loop, without any thread.
+    Use `Reader_mode="asyncio"` so that no data thread reads the port meanwhile. Needs a selector event loop, which is the default except on Windows.
+
+    Args:
+      timeout (int | float | None, optional): Maximum wait for new bytes in seconds. Defaults to None, it will wait forever.
+      log (str | None, optional): Passed to `DataFrame.parse_packet`. Defaults to None.
+
+    Raises:
+      RuntimeError: a data thread is reading the port
+      TimeoutError: no byte arrived within `timeout`
+
+    Yields:
+      DataFrame.DataFrame: frames in arrival order, valid until the next iteration (call `retain()` to keep one longer, then `release()`)
+    """
+    if self.Reader_active or self.Buffering_active: raise RuntimeError("Data port is read by the {Reader_mode} threads".format(Reader_mode=self.Reader_mode))
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    fileno = self.Data_port.fileno()
+    pending: collections.deque[DataFrame.DataFrame] = collections.deque() # split but not yet parsed, released if the stream is closed
+    try:
+      while True:
+        if len(pending) == 0: pending.extend(self.Data_Split_unit())
+        if len(pending) == 0: 
+          if self.Data_port.in_waiting == 0: 
+            # watch the port only while waiting, a readable fd left registered would wake the loop until the bytes are read
+            readable.clear()
+            loop.add_reader(fileno, readable.set)
+            try: await asyncio.wait_for(readable.wait(), timeout)
+            finally: loop.remove_reader(fileno)
+          with self._DataPort_lock_, self.buffer_lock: self.buffer.readinto(self.Data_port, self.Data_port.in_waiting)
+          continue
+        dataFrame = pending.popleft()
+        if not self.Data_Decode_unit(dataFrame, log): continue
+        dataFrame.retain()
+        try: yield dataFrame
+        finally: dataFrame.release()
+    finally:
+      for dataFrame in pending: dataFrame.release()
+
+  def Data_Decode_continuous(self, log: str | None = None) -> None:
+    try:
+      while self.Decode_active: 
+        dataFrame = self.queue.get(self.Reader_timeout)
+        if dataFrame is not None: self.Data_Decode_unit(dataFrame, log)
+    except KeyboardInterrupt:
+      pass
+  def Data_Decode_thread_start(self):
+    self.Decode_active = True
+    if self.Decode_thread.is_alive(): return
+    self.Decode_thread = threading.Thread(target=self.Data_Decode_continuous)
+    self.Decode_thread.start()
+  def Data_Decode_thread_stop(self):
+    self.Decode_active = False
+    if self.Decode_thread.is_alive() and self.Decode_thread is not threading.current_thread(): 
+      self.Decode_thread.join(self.Reader_timeout * 2)
+    self.queue.clear()
+
+  def subscribe(self, callback: typing.Callable[[DataFrame.DataFrame], None], TLV_types: set[int] | None = None, executor: concurrent.futures.Executor | None = None, Queue_capacity: int = 8, Queue_policy: str = "drop-oldest") -> Pipeline.Subscriber:
+    """Call `callback` with every published frame
+
+    All subscribers receive the same frame object, which must be treated as read-only and not used after the callback returns (call `retain()` to keep it longer, then `release()`).
+    Each subscriber has its own bounded queue, so a slow callback only drops its own frames; with a frame pool, every subscriber may hold up to `Queue_capacity + 1` pooled frames.
+
+    Args:
+      callback (Callable[[DataFrame.DataFrame], None]): Called from the subscriber's worker
+      TLV_types (set[int] | None, optional): Only deliver frames carrying one of these TLVs, which are then also decoded if `set_TLV_types` restricted decoding. Defaults to None, it will deliver every frame.
+      executor (concurrent.futures.Executor | None, optional): Runs the callback. Defaults to None, it will use a dedicated thread.
+      Queue_capacity (int, optional): Maximum number of pending frames of this subscriber. Defaults to 8.
+      Queue_policy (str, optional): "drop-oldest" or "drop-newest". Defaults to "drop-oldest".
+
+    Returns:
+      Pipeline.Subscriber: handle for `unsubscribe` and `snapshot()`
+    """
+    subscriber = Pipeline.Subscriber(callback, TLV_types, executor, Queue_capacity, Queue_policy, release=DataFrame.DataFrame.release, timeout=self.Reader_timeout)
+    if TLV_types is not None and self.decoder.TLV_types is not None: self.decoder.TLV_types = self.decoder.TLV_types | set(TLV_types)
+    subscriber.start()
+    with self.frame_condition: self.subscribers = self.subscribers + (subscriber,)
+    return subscriber
+  def unsubscribe(self, subscriber: Pipeline.Subscriber) -> None:
+    """Stop delivering to `subscriber` and release its pending frames"""
+    with self.frame_condition: self.subscribers = tuple(other for other in self.subscribers if other is not subscriber)
+    subscriber.close()
+  def set_TLV_types(self, TLV_types: set[int] | None) -> None:
+    """Declare which TLVs to decode, e.g. `{DataFrame.DataFrame.TLV_detectedObjects, DataFrame.DataFrame.TLV_statsInfo}`
+
+    Args:
+      TLV_types (set[int] | None): TypeIds to decode (the `TLV_types` of the subscribers are always added), other TLVs are skipped without being touched. None decodes every TLV lazily.
+    """
+    if TLV_types is not None: 
+      TLV_types = set(TLV_types)
+      for subscriber in self.subscribers: 
+        if subscriber.TLV_types is not None: TLV_types |= subscriber.TLV_types
+    self.decoder.TLV_types = TLV_types
   def set_cfarRangeThreshold_dB(self, threshold_dB: int | float):
     self.config.set_CfarRangeThreshold_dB(threshold_dB)
   def set_removeStaticClutter(self, enabled: bool):
     self.config.set_RemoveStaticClutter(enabled)
   def set_framePeriodicity(self, FramePeriodicity_ms: int | float):
     self.config.set_FramePeriodicity(FramePeriodicity_ms)
-  def get_detectedPoints(self, wait_new: bool = False) -> list[tuple]:
-    while wait_new and self.data.CRC32 == self.crc32: pass
-    self.crc32 = self.data.CRC32
-    return self.data.detectedPoints()
+  def publish_frame(self, data: DataFrame.DataFrame) -> int:
+    """Replace the latest frame, wake every waiting consumer and hand the frame to the subscribers
+
+    Args:
+      data (DataFrame.DataFrame): Parsed frame, its reference (if pooled) is taken over by `self.data`
+
+    Returns:
+      int: sequence number of the published frame
+    """
+    with self.frame_condition:
+      if self.frames_active: 
+        if len(self.frames) == self.frames.maxlen: self.frames[0].release()
+        self.frames.append(data.retain())
+      previous, self.data = self.data, data
+      self.frame_seq += 1
+      self.frame_condition.notify_all()
+      frame_seq = self.frame_seq
+      subscribers = self.subscribers
+    previous.release()
+    for subscriber in subscribers: 
+      if subscriber.accepts(data): subscriber.offer(data.retain())
+    return frame_seq
+  def wait_for_frame(self, after_seq: int | None = None, timeout: int | float | None = None) -> tuple[int, DataFrame.DataFrame] | None:
+    """Block until a frame newer than `after_seq` is published
+
+    Args:
+      after_seq (int | None, optional): Last sequence number seen by the caller. Defaults to None, it will wait for the next frame.
+      timeout (int | float | None, optional): Maximum wait in seconds. Defaults to None, it will wait forever.
+
+    Returns:
+      tuple[int, DataFrame.DataFrame] | None: `(frame_seq, data)` of the latest frame, or None on timeout. Call `data.release()` when done with it.
+    """
+    with self.frame_condition:
+      if after_seq is None: after_seq = self.frame_seq
+      if not self.frame_condition.wait_for(lambda: self.frame_seq > after_seq, timeout): return None
+      return self.frame_seq, self.data.retain()
+  def get_frames(self, wait_new: bool = False, timeout: int | float | None = None) -> list[DataFrame.DataFrame]:
+    """Take every frame published since the last call
+
+    Frames are only collected once this was called, call it (e.g. before `sensorStart`) to start collecting.
+
+    Args:
+      wait_new (bool, optional): Block until at least one frame is pending. Defaults to False.
+      timeout (int | float | None, optional): Maximum wait in seconds when `wait_new`. Defaults to None, it will wait forever.
+
+    Returns:
+      list[DataFrame.DataFrame]: frames in arrival order (at most `Frames_capacity`, older ones are dropped). Call `release()` on each when done with it.
+    """
+    with self.frame_condition:
+      self.frames_active = True
+      if wait_new: self.frame_condition.wait_for(lambda: len(self.frames) > 0, timeout)
+      frames = list(self.frames)
+      self.frames.clear()
+    return frames
+  def set_gap_callback(self, on_gap: typing.Callable[[int, int, int], None] | None) -> None:
+    """Call `on_gap(expected, received, missed)` whenever frameNumbers show missed frames, e.g. to lower `framePeriodicity` or disable TLVs
+
+    Args:
+      on_gap (Callable[[int, int, int], None] | None): Callback run in the parsing thread (exceptions are counted in `gapCallbackErrors`), None to remove it
+    """
+    self.decoder.frameNumbers.on_gap = on_gap
+  def get_statistics(self) -> dict[str, int | float | str]:
+    """Get a snapshot of the parse counters (see `DataFrame.ParseStatistics`) and the buffer usage, to size buffers and baud rates
+
+    Returns:
+      dict[str, int | float | str]: counters by name, the frameNumber continuity (see `DataFrame.FrameNumberTracker`), the queue state (see `Pipeline.FrameQueue.snapshot`), plus `bufferUsed`, `bufferCapacity`, `framesPublished` and `framePoolMisses`
+    """
+    with self.buffer_lock:
+      statistics: dict[str, int | float | str] = self.decoder.statistics.snapshot()
+      statistics.update(self.decoder.frameNumbers.snapshot())
+      statistics["bufferUsed"] = len(self.buffer)
+      statistics["bufferCapacity"] = self.buffer.capacity
+      statistics["framePoolMisses"] = self.decoder.pool.misses if self.decoder.pool is not None else 0
+    statistics["framesPublished"] = self.frame_seq
+    statistics.update(self.queue.snapshot())
+    return statistics
+  def update_framePool(self) -> DataFrame.FramePool | None:
+    """Size the frame pool for the current configuration (called at sensorStart), rebuilt only when the largest frame size changes
+
+    Returns:
+      DataFrame.FramePool | None: frame pool used by the decoder, None without `Frame_pool_size` or before the profile is configured
+    """
+    packetCapacity = DataFrame.FramePool.packetCapacity_from_parameter(self.config.parameter) if self.Frame_pool_size is not None else None
+    with self.buffer_lock:
+      if packetCapacity is None: self.decoder.pool = None
+      elif self.decoder.pool is None or self.decoder.pool.packetCapacity != packetCapacity:
+        self.decoder.pool = DataFrame.FramePool(self.Frame_pool_size, packetCapacity)
+      return self.decoder.pool
+  def update_frameLayout(self) -> DataFrame.FrameLayout | None:
+    """Compile the expected frame layout of the current configuration (called at sensorStart)
+
+    Returns:
+      DataFrame.FrameLayout | None: layout used by the decoder, None before `guiMonitor` and the profile are configured
+    """
+    layout = DataFrame.FrameLayout.compile(self.config)
+    with self.buffer_lock: self.decoder.layout = layout
+    return layout
+  def get_pointUnits(self) -> DataFrame.DataFrame.PointUnits | None:
+    """Get the range/velocity lookup tables of the current configuration
+
+    Returns:
+      DataFrame.DataFrame.PointUnits | None: lookup tables, None if the profile is not configured yet
+    """
+    if self.pointUnits is None or not self.pointUnits.matches(self.config.parameter):
+      self.pointUnits = DataFrame.DataFrame.PointUnits.from_parameter(self.config.parameter)
+    return self.pointUnits
+  def next_frame(self, wait_new: bool = False, timeout: int | float | None = None) -> DataFrame.DataFrame | None:
+    """Get the latest frame, see `get_detectedPoints`
+
+    Returns:
+      DataFrame.DataFrame | None: latest frame, None on timeout. Call `release()` when done with it.
+    """
+    if wait_new: 
+      # wait for a frame whose contents differ from the last returned one
+      deadline = time.monotonic() + timeout if timeout is not None else None
+      while True:
+        latest = self.wait_for_frame(self.consumed_seq, max(0, deadline - time.monotonic()) if deadline is not None else None)
+        if latest is None: return None
+        self.consumed_seq, data = latest
+        if data.fingerprint != self.crc32: break
+        data.release()
+    else: 
+      with self.frame_condition:
+        self.consumed_seq, data = self.frame_seq, self.data.retain()
+    self.crc32 = data.fingerprint
+    return data
+  def get_detectedPoints(self, wait_new: bool = False, timeout: int | float | None = None) -> list[tuple]:
+    """Get detected points of the latest frame
+
+    Args:
+      wait_new (bool, optional): Block until a frame newer than the last returned one arrives. Defaults to False.
+      timeout (int | float | None, optional): Maximum wait in seconds when `wait_new`. Defaults to None, it will wait forever.
+
+    Returns:
+      list[tuple]: (x, y, z) of detected points, empty on timeout
+    """
+    data = self.next_frame(wait_new, timeout)
+    if data is None: return []
+    try: return data.detectedPoints()
+    finally: data.release()
+  def get_points_array(self, wait_new: bool = False, timeout: int | float | None = None, units: bool = False) -> numpy.ndarray:
+    """Get detected points of the latest frame as one float32 array
+
+    Args:
+      wait_new (bool, optional): Block until a frame newer than the last returned one arrives. Defaults to False.
+      timeout (int | float | None, optional): Maximum wait in seconds when `wait_new`. Defaults to None, it will wait forever.
+      units (bool, optional): Append range (m) and radial velocity (m/s) columns from the configured profile. Defaults to False.
+
+    Returns:
+      numpy.ndarray: (N, 3) of (x, y, z), or (N, 5) of (x, y, z, range, velocity) with `units`; no rows on timeout
+    """
+    pointUnits = self.get_pointUnits() if units else None
+    data = self.next_frame(wait_new, timeout)
+    if data is None: return numpy.empty((0, 3 if pointUnits is None else 5), dtype=numpy.float32)
+    try: return data.points_array(pointUnits)
+    finally: data.release()
 
 # %%
 if __name__ == '__main__':